@@ -62,7 +62,7 @@ CREATE TABLE IF NOT EXISTS log_event (
     span_id          TEXT,
 
     -- Embedding vector (semantic representation)
-    embedding        VECTOR(384),            -- adjust if using different model dims
+    embedding        HALFVEC(384),           -- fp16; adjust if using different model dims
 
     metadata         JSONB,                   -- flexible metadata
 
@@ -88,8 +88,10 @@ CREATE INDEX IF NOT EXISTS idx_log_event_service_level
 CREATE INDEX IF NOT EXISTS idx_log_event_metadata_gin
     ON log_event USING GIN (metadata);
 
--- HNSW vector index for semantic search
+-- HNSW vector index for semantic search (embeddings are stored unit-length,
+-- so inner product ranks like cosine distance)
 CREATE INDEX IF NOT EXISTS idx_log_event_embedding_hnsw
-    ON log_event USING hnsw (embedding vector_cosine_ops);
+    ON log_event USING hnsw (embedding halfvec_ip_ops)
+    WITH (m = 16, ef_construction = 64);
 
 -- End of file
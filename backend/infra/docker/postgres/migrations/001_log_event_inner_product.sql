@@ -0,0 +1,18 @@
+-- ===========================================================
+-- 001: inner-product search on log_event.embedding
+-- ===========================================================
+-- Retrieval orders by `embedding <#> query` (negative inner product) on
+-- unit-length vectors, which ranks identically to cosine distance but skips
+-- the per-row norm computations. Existing rows are normalized once and the
+-- HNSW index is rebuilt with the matching operator class.
+
+UPDATE log_event
+   SET embedding = l2_normalize(embedding)
+ WHERE embedding IS NOT NULL;
+
+DROP INDEX IF EXISTS idx_log_event_embedding_hnsw;
+
+CREATE INDEX IF NOT EXISTS idx_log_event_embedding_hnsw
+    ON log_event USING hnsw (embedding vector_ip_ops);
+
+-- End of file
@@ -0,0 +1,13 @@
+-- ===========================================================
+-- 002: explicit HNSW build parameters for log_event.embedding
+-- ===========================================================
+-- Pins the graph parameters (m = 16, ef_construction = 64) the retrieval path
+-- is tuned for; queries raise hnsw.ef_search per transaction with top_k.
+
+DROP INDEX IF EXISTS idx_log_event_embedding_hnsw;
+
+CREATE INDEX IF NOT EXISTS idx_log_event_embedding_hnsw
+    ON log_event USING hnsw (embedding vector_ip_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- End of file
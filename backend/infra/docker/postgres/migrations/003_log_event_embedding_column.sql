@@ -0,0 +1,15 @@
+-- ===========================================================
+-- 003: embeddings live in log_event.embedding, not metadata
+-- ===========================================================
+-- Older ingests stored the vector as metadata->'embedding' (a JSON list).
+-- Ensure the column exists, move those vectors into it (normalized for the
+-- inner-product HNSW index) and drop the JSON copy.
+
+ALTER TABLE log_event ADD COLUMN IF NOT EXISTS embedding VECTOR(384);
+
+UPDATE log_event
+   SET embedding = l2_normalize((metadata->'embedding')::text::vector),
+       metadata  = metadata - 'embedding'
+ WHERE metadata ? 'embedding';
+
+-- End of file
@@ -0,0 +1,20 @@
+-- ===========================================================
+-- 004: store log_event.embedding as halfvec(384)
+-- ===========================================================
+-- FP16 halves the heap and HNSW index footprint (768 B instead of 1.5 KB
+-- per vector) with no practical recall loss on unit-length MiniLM
+-- embeddings; index scans move half the bytes.
+
+DROP INDEX IF EXISTS idx_log_event_embedding_hnsw;
+
+ALTER TABLE log_event
+    ALTER COLUMN embedding TYPE HALFVEC(384) USING embedding::halfvec(384);
+
+-- Recreated with the new column type on the next bulk ingest.
+DROP TABLE IF EXISTS log_event_stage;
+
+CREATE INDEX IF NOT EXISTS idx_log_event_embedding_hnsw
+    ON log_event USING hnsw (embedding halfvec_ip_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- End of file
@@ -3,9 +3,14 @@ import sys
 import logging
 import time
 from pathlib import Path
+from typing import Any
+
+import numpy as np
+import orjson
 from flask import Flask, jsonify, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from sentence_transformers import SentenceTransformer
+from werkzeug.exceptions import NotFound
 
 # Allow running as script (no parent package) by adding backend/src to sys.path
 if __package__ is None:
@@ -13,24 +18,47 @@ if __package__ is None:
     src_dir = current.parents[1]  # backend/src
     if str(src_dir) not in sys.path:
         sys.path.insert(0, str(src_dir))
-    from api.rag.log_rag import answer_with_rag  # type: ignore
+    from api.embedder import encode_question, get_embedder  # type: ignore
+    from api.rag.log_rag import EMBED_DIM, answer_with_rag  # type: ignore
 else:
-    from .rag.log_rag import answer_with_rag
+    from .embedder import encode_question, get_embedder
+    from .rag.log_rag import EMBED_DIM, answer_with_rag
 
-_embedder: SentenceTransformer | None = None
 logger = logging.getLogger(__name__)
 
-def _get_embedder() -> SentenceTransformer:
-    global _embedder
-    if _embedder is None:
-        _embedder = SentenceTransformer("all-MiniLM-L6-v2")
-    return _embedder
+IMMUTABLE_ASSET_MAX_AGE = 31536000  # one year
+
+
+class _ORJSONProvider(DefaultJSONProvider):
+    # RAG responses carry long raw log lines and float distances; orjson serializes them
+    # several times faster than the stdlib encoder and handles numpy values natively.
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+class _FrontendFlask(Flask):
+    def get_send_file_max_age(self, filename: str | None) -> int | None:
+        # Vite emits content-hashed files under assets/, so they never change in place;
+        # everything else (index.html, favicons) must be revalidated.
+        if filename and filename.startswith("assets/"):
+            return IMMUTABLE_ASSET_MAX_AGE
+        return 0
 
 
-def create_app():
+def create_app(*, preload_embedder: bool = True):
+    if preload_embedder:
+        # Load the model at startup so the first /api/rag/chat request does not pay for it.
+        load_start = time.perf_counter()
+        embedder = get_embedder()
+        logger.info("Embedder loaded on %s in %.3fs", embedder.device, time.perf_counter() - load_start)
+
     # backend/src/api/app.py -> parents[3] is repo root
     static_dir = Path(__file__).resolve().parents[3] / "frontend" / "dist"
-    app = Flask(__name__, static_folder=str(static_dir), static_url_path="/")
+    app = _FrontendFlask(__name__, static_folder=str(static_dir), static_url_path="/")
+    app.json = _ORJSONProvider(app)
     CORS(app)
 
     @app.route("/api/health", methods=["GET"])
@@ -54,11 +82,28 @@ def create_app():
     def rag_query():
         payload = request.get_json(silent=True) or {}
         question = (payload.get("question") or "").strip()
-        query_vector = payload.get("vector") or payload.get("question_vector")
+        raw_vector = payload.get("vector") or payload.get("question_vector")
+        row_id = payload.get("row_id")
         top_k = int(payload.get("top_k", 5))
 
-        if not query_vector:
-            return jsonify({"error": "vector is required (384-length embedding)"}), 400
+        if not raw_vector and row_id is None:
+            return jsonify({"error": "vector (384-length embedding) or row_id is required"}), 400
+
+        # Validate once at the edge; the float32 array then flows to the binary pgvector
+        # binding without per-element conversion and before any DB connection is taken.
+        query_vector = None
+        if raw_vector:
+            try:
+                query_vector = np.asarray(raw_vector, dtype=np.float32)
+            except (TypeError, ValueError):
+                query_vector = None
+            if query_vector is None or query_vector.shape != (EMBED_DIM,):
+                return jsonify({"error": f"vector must be a list of {EMBED_DIM} numbers"}), 400
+        else:
+            try:
+                row_id = int(row_id)
+            except (TypeError, ValueError):
+                return jsonify({"error": "row_id must be an integer"}), 400
 
         start = time.perf_counter()
         logger.info("RAG /query start: top_k=%s", top_k)
@@ -66,6 +111,7 @@ def create_app():
             result = answer_with_rag(
                 question or "Summarize the relevant log events.",
                 query_vector=query_vector,
+                row_id=None if query_vector is not None else row_id,
                 top_k=top_k,
             )
             elapsed = time.perf_counter() - start
@@ -87,9 +133,8 @@ def create_app():
         start = time.perf_counter()
         logger.info("RAG /chat start: top_k=%s", top_k)
         try:
-            embedder = _get_embedder()
             embed_start = time.perf_counter()
-            query_vector = embedder.encode(question).tolist()
+            query_vector = encode_question(question)
             logger.info("Embedding generated in %.3fs", time.perf_counter() - embed_start)
             result = answer_with_rag(
                 question or "Summarize the relevant log events.",
@@ -103,14 +148,24 @@ def create_app():
             logging.exception("RAG chat failed")
             return jsonify({"error": str(exc)}), 500
 
-    @app.route("/", defaults={"path": ""})
-    @app.route("/<path:path>")
-    def serve_frontend(path: str):
-        full_path = static_dir / path
-        if path and full_path.exists():
-            return send_from_directory(app.static_folder, path)
-        return send_from_directory(app.static_folder, "index.html")
-    
+    def _index():
+        return send_from_directory(app.static_folder, "index.html", max_age=0)
+
+    @app.route("/")
+    def serve_index():
+        return _index()
+
+    # Built files are served by Flask's own static route; any other non-API path is a
+    # client-side route, so it falls back to the SPA entry point.
+    @app.errorhandler(NotFound)
+    def spa_fallback(error: NotFound):
+        if request.path.startswith("/api/"):
+            return jsonify({"error": "not found"}), 404
+        try:
+            return _index()
+        except NotFound:
+            return error
+
     return app
 
 
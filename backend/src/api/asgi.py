@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Sequence
+
+import numpy as np
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+# Allow running as script (no parent package) by adding backend/src to sys.path
+if __package__ is None:
+    current = Path(__file__).resolve()
+    src_dir = current.parents[1]  # backend/src
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    from api.embedder import encode_question, get_embedder  # type: ignore
+    from api.rag.log_rag import EMBED_DIM, astream_rag  # type: ignore
+else:
+    from .embedder import encode_question, get_embedder
+    from .rag.log_rag import EMBED_DIM, astream_rag
+
+logger = logging.getLogger(__name__)
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_answer(
+    question: str,
+    *,
+    query_vector: Sequence[float],
+    top_k: int,
+) -> AsyncIterator[str]:
+    start = time.perf_counter()
+    try:
+        async for event, data in astream_rag(question, query_vector=query_vector, top_k=top_k):
+            yield _sse(event, data)
+        yield _sse("done", {"elapsed": round(time.perf_counter() - start, 3)})
+    except Exception as exc:
+        logger.exception("Streaming RAG request failed")
+        yield _sse("error", {"error": str(exc)})
+
+
+def create_asgi_app(*, preload_embedder: bool = True) -> FastAPI:
+    """
+    ASGI variant of the RAG API. Answers stream back as server-sent events
+    (a "sources" event, then "token" events, then "done"), so concurrent chats do not
+    hold a worker thread for the full LLM call.
+    """
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        if preload_embedder:
+            load_start = time.perf_counter()
+            embedder = await run_in_threadpool(get_embedder)
+            logger.info("Embedder loaded on %s in %.3fs", embedder.device, time.perf_counter() - load_start)
+        yield
+
+    app = FastAPI(title="genai-infra-lab", lifespan=lifespan)
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.post("/api/rag/query")
+    async def rag_query(request: Request):
+        payload = await request.json()
+        question = (payload.get("question") or "").strip()
+        raw_vector = payload.get("vector") or payload.get("question_vector")
+        top_k = int(payload.get("top_k", 5))
+
+        if not raw_vector:
+            return JSONResponse({"error": "vector is required (384-length embedding)"}, status_code=400)
+
+        # Validate before the stream opens: once the 200 and SSE headers are sent, a bad
+        # vector could only surface as an error event mid-stream.
+        try:
+            query_vector = np.asarray(raw_vector, dtype=np.float32)
+        except (TypeError, ValueError):
+            query_vector = None
+        if query_vector is None or query_vector.shape != (EMBED_DIM,):
+            return JSONResponse({"error": f"vector must be a list of {EMBED_DIM} numbers"}, status_code=400)
+
+        logger.info("RAG /query stream start: top_k=%s", top_k)
+        return StreamingResponse(
+            _stream_answer(
+                question or "Summarize the relevant log events.",
+                query_vector=query_vector,
+                top_k=top_k,
+            ),
+            media_type="text/event-stream",
+        )
+
+    @app.post("/api/rag/chat")
+    async def rag_chat(request: Request):
+        payload = await request.json()
+        question = (payload.get("question") or "").strip()
+        top_k = int(payload.get("top_k", 5))
+
+        if not question:
+            return JSONResponse({"error": "question is required"}, status_code=400)
+
+        logger.info("RAG /chat stream start: top_k=%s", top_k)
+        embed_start = time.perf_counter()
+        query_vector = await run_in_threadpool(encode_question, question)
+        logger.info("Embedding generated in %.3fs", time.perf_counter() - embed_start)
+        return StreamingResponse(
+            _stream_answer(question, query_vector=query_vector, top_k=top_k),
+            media_type="text/event-stream",
+        )
+
+    return app
+
+
+app = create_asgi_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    port = int(os.environ.get("PORT", 8000))
+    uvicorn.run(app, host="0.0.0.0", port=port, loop="uvloop")
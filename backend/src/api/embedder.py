@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+
+from sentence_transformers import SentenceTransformer
+
+from .embedding_batcher import EmbeddingBatcher
+
+logger = logging.getLogger(__name__)
+
+EMBED_MODEL_NAME = "all-MiniLM-L6-v2"
+EMBED_MAX_SEQ_LENGTH = 128
+EMBED_BATCH_SIZE = 32
+EMBED_BATCH_HOLD_SECONDS = 0.01
+
+_embedder: SentenceTransformer | None = None
+_batcher: EmbeddingBatcher | None = None
+
+
+def get_embedder() -> SentenceTransformer:
+    global _embedder
+    if _embedder is None:
+        model = SentenceTransformer(EMBED_MODEL_NAME)
+        # Chat questions are short; a tighter cap keeps padding and attention cost down.
+        model.max_seq_length = EMBED_MAX_SEQ_LENGTH
+        if model.device.type == "cuda":
+            model.half()
+        _embedder = model
+    return _embedder
+
+
+def _encode_batch(texts: list[str]):
+    return get_embedder().encode(
+        texts,
+        batch_size=EMBED_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    )
+
+
+def _get_batcher() -> EmbeddingBatcher:
+    # Concurrent requests share one forward pass instead of encoding one question each.
+    global _batcher
+    if _batcher is None:
+        _batcher = EmbeddingBatcher(
+            _encode_batch,
+            max_batch_size=EMBED_BATCH_SIZE,
+            max_batch_hold=EMBED_BATCH_HOLD_SECONDS,
+        )
+    return _batcher
+
+
+@lru_cache(maxsize=4096)
+def encode_question(question: str) -> tuple[float, ...]:
+    """
+    Embed a chat question. Repeated questions (FAQ-style prompts, polling dashboards)
+    are served from an in-process cache without a model forward pass.
+    """
+    return tuple(_get_batcher().encode(question))
+
+
+__all__ = ["EMBED_MODEL_NAME", "encode_question", "get_embedder"]
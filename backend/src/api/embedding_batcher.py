@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from queue import Empty, Queue
+from threading import Event, Thread
+from typing import Any, Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingEncode:
+    text: str
+    done: Event = field(default_factory=Event)
+    result: list[float] | None = None
+    error: BaseException | None = None
+
+
+class EmbeddingBatcher:
+    """
+    Groups concurrent single-text encode requests into one batched model call.
+
+    A background thread waits for the first request, then keeps collecting for up to
+    ``max_batch_hold`` seconds or until ``max_batch_size`` texts are queued, and resolves
+    every caller from a single ``encode_batch`` call.
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[list[str]], Sequence[Any]],
+        *,
+        max_batch_size: int = 32,
+        max_batch_hold: float = 0.01,
+    ) -> None:
+        self._encode_batch = encode_batch
+        self.max_batch_size = max_batch_size
+        self.max_batch_hold = max_batch_hold
+        self._queue: "Queue[_PendingEncode]" = Queue()
+        self._thread = Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def encode(self, text: str) -> list[float]:
+        pending = _PendingEncode(text)
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        assert pending.result is not None
+        return pending.result
+
+    def _collect(self) -> list[_PendingEncode]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_batch_hold
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            start = time.perf_counter()
+            try:
+                vectors = self._encode_batch([pending.text for pending in batch])
+                for pending, vector in zip(batch, vectors):
+                    pending.result = vector.tolist() if hasattr(vector, "tolist") else list(vector)
+                logger.debug("Encoded batch of %s texts in %.3fs", len(batch), time.perf_counter() - start)
+            except Exception as exc:
+                logger.exception("Batched embedding failed for %s texts", len(batch))
+                for pending in batch:
+                    pending.error = exc
+            finally:
+                for pending in batch:
+                    pending.done.set()
+
+
+__all__ = ["EmbeddingBatcher"]
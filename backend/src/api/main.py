@@ -26,7 +26,7 @@ def main() -> None:
     log_level = os.environ.get("LOG_LEVEL", "INFO")
     logging.basicConfig(level=getattr(logging, log_level.upper(), logging.INFO))
 
-    app = create_app()
+    app = create_app(preload_embedder=False)
     client = app.test_client()
 
     health = client.get("/api/health")
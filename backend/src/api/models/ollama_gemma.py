@@ -1,16 +1,23 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
 
 url = "http://localhost:11434/api/generate"
 
-payload = {
-    "model": "gemma3:270m",
-    "prompt": "Explain embeddings in simple terms",
-    "stream": False
-}
+# One keep-alive session so repeated prompts reuse the connection to Ollama.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_maxsize=32))
 
-response = requests.post(url, json=payload)
-response.raise_for_status()
 
-result = response.json()
-print(result["response"])
+def generate(prompt: str, *, model: str = "gemma3:270m") -> str:
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": False
+    }
+    response = _SESSION.post(url, json=payload)
+    response.raise_for_status()
+    return response.json()["response"]
+
+
+if __name__ == "__main__":
+    print(generate("Explain embeddings in simple terms"))
@@ -1,13 +1,31 @@
+"""
+Retrieval-augmented answers over ingested log_event rows.
+
+Similarity search relies on the HNSW index created by
+backend/infra/docker/postgres/init/01_pgvector_setup.sql (existing databases:
+migrations/004_log_event_halfvec.sql); hnsw.ef_search is raised per query so
+recall keeps up with top_k.
+"""
+
 from __future__ import annotations
 
 import argparse
+import asyncio
+import atexit
 import json
 import logging
+import os
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Sequence
+from functools import lru_cache
+from typing import Any, AsyncIterator, Iterable, Sequence
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from pgvector.psycopg import register_vector
+from psycopg_pool import ConnectionPool
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_openai import ChatOpenAI
@@ -18,24 +36,78 @@ except ImportError:
 try:
     # when imported as package
     from ...vectorstore.client.connection import (
+        POOL_MAX_IDLE,
+        POOL_MAX_LIFETIME,
         PgVectorConnectionConfig,
-        PgVectorConnectionManager,
+        _conninfo,
     )
 except ImportError:
     # fallback when run as script with backend/src on sys.path
     from vectorstore.client.connection import (  # type: ignore
+        POOL_MAX_IDLE,
+        POOL_MAX_LIFETIME,
         PgVectorConnectionConfig,
-        PgVectorConnectionManager,
+        _conninfo,
     )
+try:
+    from .proximity_cache import ProximityCache
+except ImportError:
+    from api.rag.proximity_cache import ProximityCache  # type: ignore
+
+from langchain.globals import set_debug, set_llm_cache
+from langchain_community.cache import SQLiteCache
 
-from langchain.globals import set_debug
-set_debug(True)
+# Verbose LangChain tracing dumps every prompt and context chunk; opt in only when debugging.
+if os.environ.get("LANGCHAIN_DEBUG") == "1":
+    set_debug(True)
 
 logger = logging.getLogger(__name__)
 
 EMBED_DIM = 384
-
-@dataclass(frozen=True)
+NO_MATCH_ANSWER = "No matching log events were found for this query."
+
+_PROMPT = PromptTemplate(
+    input_variables=["question", "context"],
+    template=(
+        "You are an SRE assistant analyzing application logs.\n"
+        "Use the provided context to answer the question concisely.\n"
+        "You may infer standard failure semantics commonly associated with the observed exceptions,\n"
+        "but do not invent events not implied by the logs.\n\n"
+        "Classify outcomes as:\n"
+        "- TRANSIENT (error occurred but recovered)\n"
+        "- TERMINAL (workflow failed)\n"
+        "- NONE (no failure)\n\n"
+        "Context:\n{context}\n\n"
+        "Question: {question}\n"
+        "Answer:"
+    ),
+)
+_PARSER = StrOutputParser()
+
+# Near-duplicate query vectors reuse recent retrieval results instead of re-running the pgvector scan.
+PROXIMITY_CAPACITY = int(os.environ.get("RAG_PROXIMITY_CAPACITY", "256"))
+PROXIMITY_TAU = float(os.environ.get("RAG_PROXIMITY_TAU", "0.05"))
+PROXIMITY_TTL = float(os.environ.get("RAG_PROXIMITY_TTL", "300"))
+
+# One cache per dotenv_path, so a hit never returns rows from a different database.
+_proximity_caches: dict[str | None, ProximityCache] = {}
+_proximity_lock = threading.Lock()
+
+# pgvector's default ef_search (40) caps how many candidates an HNSW scan can return.
+HNSW_EF_SEARCH_MIN = 40
+HNSW_EF_SEARCH_MAX = 1000
+
+POOL_MIN_SIZE = 2
+POOL_MAX_SIZE = 10
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+LLM_CACHE_PATH = os.environ.get("RAG_LLM_CACHE_PATH", ".llm_cache.db")
+_llm_cache_enabled = False
+
+
+@dataclass(frozen=True, slots=True)
 class RetrievedChunk:
     id: int
     message: str
@@ -44,6 +116,47 @@ class RetrievedChunk:
     metadata: Any
 
 
+def _get_pool(dotenv_path: str | None = None) -> ConnectionPool:
+    # One pool per process: requests check out a warm, vector-registered connection
+    # instead of re-reading .env and opening a new Postgres session each time.
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = PgVectorConnectionConfig.from_env(dotenv_path)
+                # Same keepalive/connect_timeout/statement_timeout conninfo and recycling
+                # as PgVectorConnectionManager, so a half-open session can't hang a request.
+                _pool = ConnectionPool(
+                    conninfo=_conninfo(config),
+                    min_size=POOL_MIN_SIZE,
+                    max_size=POOL_MAX_SIZE,
+                    timeout=config.pool_timeout,
+                    max_idle=POOL_MAX_IDLE,
+                    max_lifetime=POOL_MAX_LIFETIME,
+                    kwargs={"prepare_threshold": 0},
+                    configure=register_vector,
+                    open=True,
+                )
+                atexit.register(_pool.close)
+                logger.info("Opened pgvector pool to %s:%s/%s", config.host, config.port, config.database)
+    return _pool
+
+
+def _set_ef_search(cur, top_k: int) -> None:
+    # Transaction-scoped (SET LOCAL semantics), so pooled connections go back untouched.
+    ef_search = min(HNSW_EF_SEARCH_MAX, max(HNSW_EF_SEARCH_MIN, top_k * 4))
+    cur.execute("SELECT set_config('hnsw.ef_search', %s, true)", (str(ef_search),), prepare=True)
+
+
+def _chunks_from_rows(rows: Iterable[Sequence[Any]]) -> list[RetrievedChunk]:
+    # psycopg already yields int for bigint and float for the distance, so rows map
+    # straight onto the dataclass; 1 + neg_ip is the cosine distance for unit vectors.
+    return [
+        RetrievedChunk(log_id, message or "", raw_line, 1.0 + neg_ip, metadata)
+        for log_id, message, raw_line, metadata, neg_ip in rows
+    ]
+
+
 def _query_similar_logs(
     query_vector: Sequence[float],
     *,
@@ -54,40 +167,118 @@ def _query_similar_logs(
     if len(query_vector) != EMBED_DIM:
         raise ValueError(f"Unexpected embedding dimensions {len(query_vector)} (expected {EMBED_DIM})")
 
-    config = PgVectorConnectionConfig.from_env(dotenv_path)
-    manager = PgVectorConnectionManager(config)
-
+    # %(vector)b ships the float32 buffer through pgvector's binary dumper instead of
+    # 384 text-encoded floats that the server has to parse back; it is cast once to the
+    # column's halfvec type. Stored embeddings are unit-length, so ordering by negative
+    # inner product (<#>) ranks exactly like cosine distance without per-row norms;
+    # ordering by the output column keeps a single operator expression that the HNSW
+    # (halfvec_ip_ops) index scan serves.
     sql = """
-        SELECT id, message, raw_line, metadata, embedding <=> %(vector)s::vector AS distance
+        SELECT id, message, raw_line, metadata, embedding <#> %(vector)b::halfvec(384) AS neg_ip
         FROM log_event
         WHERE embedding IS NOT NULL
-        ORDER BY embedding <=> %(vector)s::vector
+        ORDER BY neg_ip
         LIMIT %(k)s;
     """
+    vector = np.asarray(query_vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if norm > 0.0:
+        vector = vector / norm
 
-    rows: list[RetrievedChunk] = []
-    with manager.connection() as conn:
+    with _get_pool(dotenv_path).connection() as conn:
         with conn.cursor() as cur:
-            cur.execute(sql, {"vector": query_vector, "k": top_k})
-            for row in cur.fetchall():
-                log_id, message, raw_line, metadata, distance = row
-                rows.append(
-                    RetrievedChunk(
-                        id=int(log_id),
-                        message=message or "",
-                        raw_line=raw_line,
-                        metadata=metadata,
-                        distance=float(distance),
-                    )
-                )
+            _set_ef_search(cur, top_k)
+            cur.execute(sql, {"vector": vector, "k": top_k}, prepare=True)
+            rows = _chunks_from_rows(cur)
 
     logger.info("Retrieved %s log chunks (top_k=%s) in %.3fs", len(rows), top_k, time.perf_counter() - start)
     return rows
 
 
-def _build_llm(*, dotenv_path: str | None = None) -> ChatOpenAI:
+def _query_similar_by_id(
+    row_id: int,
+    *,
+    top_k: int = 5,
+    dotenv_path: str | None = None,
+) -> list[RetrievedChunk]:
+    """
+    Neighbours of an existing log_event row in one round trip: the row's embedding is
+    resolved server-side by a scalar subquery (an init-plan parameter the HNSW index scan
+    can use) instead of being shipped to the client and bound back in.
+    """
+    start = time.perf_counter()
+    sql = """
+        SELECT id, message, raw_line, metadata,
+               embedding <#> (SELECT embedding FROM log_event WHERE id = %(id)s) AS neg_ip
+        FROM log_event
+        WHERE embedding IS NOT NULL
+          AND EXISTS (SELECT 1 FROM log_event WHERE id = %(id)s AND embedding IS NOT NULL)
+        ORDER BY neg_ip
+        LIMIT %(k)s;
+    """
+
+    with _get_pool(dotenv_path).connection() as conn:
+        with conn.cursor() as cur:
+            _set_ef_search(cur, top_k)
+            cur.execute(sql, {"id": row_id, "k": top_k}, prepare=True)
+            rows = _chunks_from_rows(cur)
+
+    if not rows:
+        raise ValueError(f"log_event id {row_id} not found or has no embedding")
+    logger.info(
+        "Retrieved %s log chunks for id=%s (top_k=%s) in %.3fs",
+        len(rows),
+        row_id,
+        top_k,
+        time.perf_counter() - start,
+    )
+    return rows
+
+
+def _proximity_cache(dotenv_path: str | None) -> ProximityCache:
+    cache = _proximity_caches.get(dotenv_path)
+    if cache is None:
+        with _proximity_lock:
+            cache = _proximity_caches.setdefault(
+                dotenv_path,
+                ProximityCache(dim=EMBED_DIM, capacity=PROXIMITY_CAPACITY, tau=PROXIMITY_TAU, ttl=PROXIMITY_TTL),
+            )
+    return cache
+
+
+def _cached_similar_logs(
+    query_vector: Sequence[float],
+    *,
+    top_k: int,
+    dotenv_path: str | None = None,
+) -> list[RetrievedChunk]:
+    proximity_cache = _proximity_cache(dotenv_path)
+    cached = proximity_cache.lookup(query_vector)
+    if cached is not None:
+        cached_top_k, cached_chunks = cached
+        if cached_top_k >= top_k:
+            logger.info("Proximity cache hit; skipping pgvector query (top_k=%s)", top_k)
+            return cached_chunks[:top_k]
+
+    chunks = _query_similar_logs(query_vector, top_k=top_k, dotenv_path=dotenv_path)
+    proximity_cache.insert(query_vector, (top_k, chunks))
+    return chunks
+
+
+def _enable_llm_cache() -> None:
+    # Identical prompt/model/temperature tuples are answered from SQLite instead of the API.
+    global _llm_cache_enabled
+    if _llm_cache_enabled:
+        return
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+    _llm_cache_enabled = True
+    logger.info("LLM completion cache enabled at %s", LLM_CACHE_PATH)
+
+
+def _build_llm(*, dotenv_path: str | None = None, streaming: bool = False) -> ChatOpenAI:
+    _enable_llm_cache()
     api_key, model_name = load_openai_settings(dotenv_path)
-    return ChatOpenAI(model=model_name, api_key=api_key, temperature=0)
+    return ChatOpenAI(model=model_name, api_key=api_key, temperature=0, streaming=streaming)
 
 
 def _format_context(chunks: Sequence[RetrievedChunk]) -> str:
@@ -99,64 +290,96 @@ def _format_context(chunks: Sequence[RetrievedChunk]) -> str:
     return "\n".join(lines)
 
 
+@lru_cache(maxsize=4)
+def _build_chain(*, dotenv_path: str | None = None, streaming: bool = False):
+    # The runnable is immutable, so it (and the dotenv/OpenAI settings read behind
+    # _build_llm) is built once per configuration rather than on every request.
+    return _PROMPT | _build_llm(dotenv_path=dotenv_path, streaming=streaming) | _PARSER
+
+
+def _sources(chunks: Sequence[RetrievedChunk]) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": chunk.id,
+            "message": chunk.message,
+            "raw_line": chunk.raw_line,
+            "distance": chunk.distance,
+        }
+        for chunk in chunks
+    ]
+
+
 def answer_with_rag(
     question: str,
     *,
-    query_vector: Sequence[float],
+    query_vector: Sequence[float] | None = None,
+    row_id: int | None = None,
     top_k: int = 5,
     dotenv_path: str | None = None,
 ) -> dict[str, Any]:
     """
-    Retrieve similar log_event rows via pgvector using a provided embedding vector and answer using OpenAI chat completion.
+    Retrieve similar log_event rows via pgvector using a provided embedding vector (or the
+    embedding of an existing log_event row) and answer using OpenAI chat completion.
     Returns a dict with answer text and the retrieved sources.
     """
     overall_start = time.perf_counter()
     logger.info("Starting RAG flow: top_k=%s", top_k)
 
     stage_start = time.perf_counter()
-    chunks = _query_similar_logs(query_vector, top_k=top_k, dotenv_path=dotenv_path)
+    if row_id is not None:
+        chunks = _query_similar_by_id(row_id, top_k=top_k, dotenv_path=dotenv_path)
+    elif query_vector is not None:
+        chunks = _cached_similar_logs(query_vector, top_k=top_k, dotenv_path=dotenv_path)
+    else:
+        raise ValueError("Either query_vector or row_id is required")
     logger.info("Finished embedding lookup in %.3fs", time.perf_counter() - stage_start)
 
+    if not chunks:
+        # Nothing to ground an answer on; skip the LLM round trip entirely.
+        logger.info("No log chunks retrieved; returning canned answer in %.3fs", time.perf_counter() - overall_start)
+        return {"answer": NO_MATCH_ANSWER, "sources": []}
+
     context_text = _format_context(chunks)
 
     stage_start = time.perf_counter()
-    prompt = PromptTemplate(
-        input_variables=["question", "context"],
-        template=(
-            "You are an SRE assistant analyzing application logs.\n"
-            "Use the provided context to answer the question concisely.\n"
-            "You may infer standard failure semantics commonly associated with the observed exceptions,\n"
-            "but do not invent events not implied by the logs.\n\n"
-            "Classify outcomes as:\n"
-            "- TRANSIENT (error occurred but recovered)\n"
-            "- TERMINAL (workflow failed)\n"
-            "- NONE (no failure)\n\n"
-            "Context:\n{context}\n\n"
-            "Question: {question}\n"
-            "Answer:"
-        ),
-    )
-
-    chain = prompt | _build_llm(dotenv_path=dotenv_path) | StrOutputParser()
+    chain = _build_chain(dotenv_path=dotenv_path)
     logger.info("Built prompt and LLM in %.3fs", time.perf_counter() - stage_start)
-    logger.info("Invoking LLM chain: %s", chain)
 
     stage_start = time.perf_counter()
     answer = chain.invoke({"question": question, "context": context_text})
     logger.info("LLM response received in %.3fs", time.perf_counter() - stage_start)
 
-    sources = [
-        {
-            "id": chunk.id,
-            "message": chunk.message,
-            "raw_line": chunk.raw_line,
-            "distance": chunk.distance,
-        }
-        for chunk in chunks
-    ]
-
     logger.info("RAG flow completed in %.3fs", time.perf_counter() - overall_start)
-    return {"answer": answer, "sources": sources}
+    return {"answer": answer, "sources": _sources(chunks)}
+
+
+async def astream_rag(
+    question: str,
+    *,
+    query_vector: Sequence[float],
+    top_k: int = 5,
+    dotenv_path: str | None = None,
+) -> AsyncIterator[tuple[str, Any]]:
+    """
+    Streaming variant of answer_with_rag. Yields ("sources", [...]) once retrieval finishes,
+    then ("token", str) for every chunk of the LLM answer as it arrives.
+    """
+    overall_start = time.perf_counter()
+    chunks = await asyncio.to_thread(_cached_similar_logs, query_vector, top_k=top_k, dotenv_path=dotenv_path)
+    yield "sources", _sources(chunks)
+    if not chunks:
+        yield "token", NO_MATCH_ANSWER
+        return
+
+    chain = _build_chain(dotenv_path=dotenv_path, streaming=True)
+    first_token_at: float | None = None
+    async for token in chain.astream({"question": question, "context": _format_context(chunks)}):
+        if first_token_at is None:
+            first_token_at = time.perf_counter()
+            logger.info("First LLM token after %.3fs", first_token_at - overall_start)
+        yield "token", token
+
+    logger.info("Streaming RAG flow completed in %.3fs", time.perf_counter() - overall_start)
 
 
 # ============================================================
@@ -174,20 +397,14 @@ def _parse_vector_arg(value: str) -> list[float]:
     return [float(x.strip()) for x in value.split(",") if x.strip()]
 
 
-def _fetch_embedding_by_id(row_id: int, dotenv_path: str | None = None) -> list[float]:
-    start = time.perf_counter()
-    config = PgVectorConnectionConfig.from_env(dotenv_path)
-    manager = PgVectorConnectionManager(config)
-    sql = "SELECT embedding FROM log_event WHERE id = %(id)s;"
-    with manager.connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(sql, {"id": row_id})
-            result = cur.fetchone()
-            if not result:
-                raise ValueError(f"log_event id {row_id} not found")
-            embedding = [float(v) for v in result[0]]
-            logger.info("Fetched embedding for id=%s in %.3fs", row_id, time.perf_counter() - start)
-            return embedding
+@lru_cache(maxsize=1)
+def _http_session() -> requests.Session:
+    # Repeated CLI calls in one process (scripts, loops) reuse keep-alive connections.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 
 def main() -> None:
@@ -197,21 +414,21 @@ def main() -> None:
     parser.add_argument("--vector", help="Embedding vector as JSON array or comma-separated floats")
     parser.add_argument("--row-id", type=int, help="Use embedding from this log_event id as the query vector")
     parser.add_argument("--top-k", type=int, default=5, help="Number of neighbors to retrieve")
-    parser.add_argument("--dotenv", type=str, default=None, help="Path to .env with PG_* vars (if using --row-id)")
     args = parser.parse_args()
 
+    payload: dict[str, Any] = {"question": args.question, "top_k": args.top_k}
     if args.vector:
-        query_vector = _parse_vector_arg(args.vector)
+        payload["vector"] = _parse_vector_arg(args.vector)
     elif args.row_id:
-        query_vector = _fetch_embedding_by_id(args.row_id, dotenv_path=args.dotenv)
+        # The server resolves the row's embedding and its neighbours in a single query.
+        payload["row_id"] = args.row_id
     else:
         parser.error("Provide either --vector or --row-id to supply a query embedding.")
         return
 
-    payload = {"question": args.question, "vector": query_vector, "top_k": args.top_k}
     logger.info("Sending RAG HTTP request to %s", args.url)
     http_start = time.perf_counter()
-    resp = requests.post(args.url, json=payload, timeout=30)
+    resp = _http_session().post(args.url, json=payload, timeout=30)
     logger.info("HTTP request completed in %.3fs", time.perf_counter() - http_start)
     print("Status:", resp.status_code)
     try:
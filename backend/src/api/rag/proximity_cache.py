@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ProximityCache:
+    """
+    Approximate cache keyed by embedding vectors.
+
+    Keys are stored L2-normalized in a fixed (capacity, dim) float32 matrix so a lookup is
+    a single matrix-vector product; the best match is accepted when its cosine distance is
+    within ``tau``. Entries are evicted FIFO once the cache is full, and entries older than
+    ``ttl`` seconds (0 = no expiry) are ignored on lookup so newly ingested rows show up.
+    """
+
+    def __init__(self, *, dim: int, capacity: int = 256, tau: float = 0.05, ttl: float = 0.0) -> None:
+        if capacity < 0:
+            raise ValueError(f"capacity must be >= 0 (got {capacity})")
+        self.dim = dim
+        self.capacity = capacity
+        self.tau = tau
+        self.ttl = ttl
+        self._keys = np.zeros((capacity, dim), dtype=np.float32)
+        self._inserted = np.zeros(capacity, dtype=np.float64)
+        self._values: list[Any] = [None] * capacity
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _normalize(self, vector: Sequence[float]) -> np.ndarray | None:
+        query = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if query.shape[0] != self.dim:
+            return None
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0:
+            return None
+        return query / norm
+
+    def lookup(self, vector: Sequence[float]) -> Any | None:
+        """
+        Return the value cached under the closest key if it lies within ``tau``, else None.
+        """
+
+        if self.capacity == 0:
+            return None
+        query = self._normalize(vector)
+        if query is None:
+            return None
+
+        with self._lock:
+            if self._size == 0:
+                return None
+            similarities = self._keys[: self._size] @ query
+            if self.ttl > 0:
+                expired = self._inserted[: self._size] < time.monotonic() - self.ttl
+                similarities[expired] = -np.inf
+            best = int(np.argmax(similarities))
+            distance = 1.0 - float(similarities[best])
+            if distance > self.tau:
+                return None
+            logger.debug("Proximity cache hit (slot=%s, distance=%.4f)", best, distance)
+            return self._values[best]
+
+    def insert(self, vector: Sequence[float], value: Any) -> None:
+        if self.capacity == 0:
+            return
+        key = self._normalize(vector)
+        if key is None:
+            return
+
+        with self._lock:
+            slot = self._next
+            self._keys[slot] = key
+            self._inserted[slot] = time.monotonic()
+            self._values[slot] = value
+            self._next = (slot + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values = [None] * self.capacity
+            self._size = 0
+            self._next = 0
+
+
+__all__ = ["ProximityCache"]
@@ -1,4 +1,3 @@
-import json
 import sys
 from pathlib import Path
 from typing import Iterable
@@ -18,6 +17,7 @@ def _setup_sys_path() -> None:
 
 _setup_sys_path()
 
+import orjson
 from dotenv import find_dotenv, load_dotenv
 from langchain.chains.sql_database.query import create_sql_query_chain
 from langchain_openai import ChatOpenAI
@@ -75,21 +75,32 @@ def create_chain() -> tuple[SQLDatabase, ChatOpenAI, object]:
     return db, llm, chain
 
 
+# Common model labels like "Query:", "SQLQuery:", "SQL:" (case-insensitive).
+_LABEL_RE = re.compile(r"^\s*(sql\s*query|sqlquery|sql|query)\s*:\s*", re.I)
+# A standalone "sql" line anywhere in the output (multiline).
+_SOLO_RE = re.compile(r"^\s*sql\s*$", re.I | re.M)
+
+
 def sanitize_sql(sql_text: str) -> str:
     cleaned = sql_text.strip()
     if "```" in cleaned:
-        parts = cleaned.split("```")
-        cleaned = "".join(part for idx, part in enumerate(parts) if idx % 2 == 1).strip()
+        cleaned = "".join(cleaned.split("```")[1::2]).strip()
+
+    # Labels can only lead the text, so the label regex runs only when it could match;
+    # a standalone "sql" line may sit anywhere, so that pass always runs.
+    if cleaned[:10].lower().startswith(("sql", "query")):
+        cleaned = _LABEL_RE.sub("", cleaned)
+    return _SOLO_RE.sub("", cleaned).strip()
+
 
-    # Strip common model labels like "Query:", "SQLQuery:", "SQL:" (case-insensitive).
-    cleaned = re.sub(r"^\s*(sql\s*query|sqlquery|sql|query)\s*:\s*", "", cleaned, flags=re.I)
-    # Strip a leading standalone "sql" line.
-    cleaned = re.sub(r"^\s*sql\s*$", "", cleaned, flags=re.I | re.M).strip()
-    return cleaned
+# Large db.run outputs are cut before prompting to cap LLM input tokens.
+RESULT_PROMPT_MAX_CHARS = 8192
 
 
 def summarize_result(llm: ChatOpenAI, question: str, result: object) -> str:
-    result_text = json.dumps(result, default=str)
+    result_text = orjson.dumps(result, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    if len(result_text) > RESULT_PROMPT_MAX_CHARS:
+        result_text = result_text[:RESULT_PROMPT_MAX_CHARS] + " ...[truncated]"
     prompt = (
         "You are a data assistant. Use only the provided query result to answer the "
         "user's question in clear, concise language.\n\n"
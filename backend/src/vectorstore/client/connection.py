@@ -1,103 +1,282 @@
 from __future__ import annotations
 
+import importlib
 import logging
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
 import os
-from typing import Any, Iterator, Mapping, Optional, Sequence, Union
+from typing import Any, AsyncIterator, Iterable, Iterator, Mapping, Optional, Sequence, Union
 
 from dotenv import load_dotenv
-import psycopg
-from psycopg import Connection, Cursor
-from pgvector.psycopg import register_vector
-
+from psycopg import AsyncConnection, AsyncCursor, Connection, Cursor
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import AsyncRowFactory, RowFactory, tuple_row
+from psycopg.sql import SQL, Composed, Identifier
+from psycopg.types import TypeInfo
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+from pgvector.psycopg import register_vector, register_vector_async
+
+try:
+    from pgvector.psycopg.bit import register_bit_info
+    from pgvector.psycopg.halfvec import register_halfvec_info
+    from pgvector.psycopg.sparsevec import register_sparsevec_info
+    from pgvector.psycopg.vector import register_vector_info
+except ImportError:  # pragma: no cover - older/newer pgvector layouts
+    register_vector_info = None  # type: ignore[assignment]
+
+# Loaded once per process here; EMBED_*/RAG_* module constants in importers rely on it.
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
 
+# Required PG_* values already read from os.environ; cleared by
+# PgVectorConnectionConfig.cache_clear() (call it after changing the environment).
+_env_cache: dict[str, str] = {}
+
+
 def _get_required_env(key: str) -> str:
+    value = _env_cache.get(key)
+    if value is not None:
+        return value
     value = os.environ.get(key)
     if not value:
         logger.error("Required environment variable '%s' not found", key)
         raise RuntimeError(f"Environment variable '{key}' is required but missing.")
     logger.debug("Loaded environment variable '%s'", key)
+    _env_cache[key] = value
     return value
 
 
-@dataclass(frozen=True)
+# HikariCP-style sizing: about two connections per client core (plus one per spindle,
+# ~0 on SSDs). Past that, Postgres backends mostly context-switch and throughput drops.
+DEFAULT_POOL_MAX_SIZE = (os.cpu_count() or 1) * 2
+POOL_MAX_SIZE_WARN = 100
+
+
+@dataclass(frozen=True, slots=True)
 class PgVectorConnectionConfig:
     host: str
     port: int
     database: str
     user: str
     password: str
+    pool_min_size: int = 1
+    pool_max_size: int = DEFAULT_POOL_MAX_SIZE
+    # Seconds connection() waits for a free pooled connection before raising.
+    pool_timeout: float = 30.0
+    # Server-side per-statement limit in ms; 0 = none, since ingest COPYs and HNSW
+    # builds legitimately run long. Set PG_STATEMENT_TIMEOUT_MS for query-serving apps.
+    statement_timeout_ms: int = 0
 
     @classmethod
     def from_env(cls, dotenv_path: Optional[str] = None) -> "PgVectorConnectionConfig":
-        env_file = dotenv_path or ".env"
-        loaded = load_dotenv(env_file, override=False)
-        logger.debug("load_dotenv path=%s loaded=%s", env_file, loaded)
+        # The .env file is parsed once per (class, path); the frozen config is shared.
+        # Call cache_clear() after changing PG_* variables (e.g. in tests).
+        return _config_from_env(cls, dotenv_path)
+
+    @staticmethod
+    def cache_clear() -> None:
+        _config_from_env.cache_clear()
+        _env_cache.clear()
+
+    @classmethod
+    def _load_env(cls, dotenv_path: Optional[str]) -> "PgVectorConnectionConfig":
+        module_name = os.environ.get("PG_ENV_MODULE")
+        if module_name:
+            _load_env_module(module_name)
+        elif dotenv_path is not None:
+            # The default .env was already loaded at import; only parse explicit paths.
+            loaded = load_dotenv(dotenv_path, override=False)
+            logger.debug("load_dotenv path=%s loaded=%s", dotenv_path, loaded)
         return cls(
             host=_get_required_env("PG_HOST"),
             port=int(os.environ.get("PG_PORT", "5432")),
             database=_get_required_env("PG_DATABASE"),
             user=_get_required_env("PG_USER"),
             password=_get_required_env("PG_PASSWORD"),
+            pool_min_size=int(os.environ.get("PG_POOL_MIN", "1")),
+            pool_max_size=int(os.environ.get("PG_POOL_MAX", str(DEFAULT_POOL_MAX_SIZE))),
+            pool_timeout=float(os.environ.get("PG_POOL_TIMEOUT", "30")),
+            statement_timeout_ms=int(os.environ.get("PG_STATEMENT_TIMEOUT_MS", "0")),
+        )
+
+
+def _load_env_module(module_name: str) -> None:
+    """
+    Load settings from an importable module (PG_ENV_MODULE) instead of parsing .env.
+    Its upper-case attributes fill os.environ without overriding it, like load_dotenv;
+    the module comes from cached bytecode, so there is no text parsing at startup.
+    Generate it from .env at deploy time, one `PG_HOST = "..."` line per variable.
+    """
+    module = importlib.import_module(module_name)
+    for key, value in vars(module).items():
+        if key.isupper() and value is not None:
+            os.environ.setdefault(key, str(value))
+    logger.debug("Loaded environment from module %s", module_name)
+
+
+@lru_cache(maxsize=None)
+def _config_from_env(
+    cls: type[PgVectorConnectionConfig], dotenv_path: Optional[str]
+) -> PgVectorConnectionConfig:
+    return cls._load_env(dotenv_path)
+
+
+# Rows per server round trip when streaming; elapsed time falls off sharply up to
+# ~100-200 rows per fetch and barely moves past that.
+DEFAULT_FETCH_SIZE = 128
+# fetch_all switches to a server-side cursor when the caller expects at least this
+# many rows: libpq then never buffers the whole result next to the Python rows.
+SERVER_SIDE_MIN_ROWS = 10_000
+
+# Prepare repeated statements (e.g. executemany INSERTs) server-side: psycopg prepares a
+# query once it has run this many times on a connection, i.e. from its second execution.
+# One-off statements stay unprepared; pass prepare=True to prepare on first use.
+PREPARE_THRESHOLD = 1
+
+
+VECTOR_TYPE_NAMES = ("vector", "bit", "halfvec", "sparsevec")
+
+
+def _register_vector_types(conn: Any, types: tuple[Optional[TypeInfo], ...]) -> None:
+    vector, bit, halfvec, sparsevec = types
+    register_vector_info(conn, vector)
+    register_bit_info(conn, bit)
+    if halfvec is not None:
+        register_halfvec_info(conn, halfvec)
+    if sparsevec is not None:
+        register_sparsevec_info(conn, sparsevec)
+
+
+# TCP keepalives detect half-open sessions (~1 min) instead of leaving a pool slot hung.
+CONNECT_OPTIONS = {
+    "connect_timeout": 10,
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 3,
+}
+# Recycle pooled connections so long-lived backends don't accumulate memory.
+POOL_MAX_IDLE = 600.0
+POOL_MAX_LIFETIME = 3600.0
+
+
+def _conninfo(config: PgVectorConnectionConfig) -> str:
+    options = dict(CONNECT_OPTIONS)
+    if config.statement_timeout_ms:
+        options["options"] = f"-c statement_timeout={config.statement_timeout_ms}"
+    return make_conninfo(
+        host=config.host,
+        port=config.port,
+        dbname=config.database,
+        user=config.user,
+        password=config.password,
+        **options,
+    )
+
+
+def _pool_sizes(
+    config: PgVectorConnectionConfig, min_size: Optional[int], max_size: Optional[int]
+) -> tuple[int, int]:
+    max_size = config.pool_max_size if max_size is None else max_size
+    min_size = min(config.pool_min_size if min_size is None else min_size, max_size)
+    if max_size > POOL_MAX_SIZE_WARN:
+        logger.warning(
+            "Connection pool max_size=%s; past ~%s connections Postgres throughput usually "
+            "drops, a smaller pool with queueing tends to do better",
+            max_size,
+            POOL_MAX_SIZE_WARN,
         )
+    return min_size, max_size
 
 
 class PgVectorConnectionManager:
     """
     Provides pgvector-ready PostgreSQL connections configured via environment variables.
+
+    Connections come from a psycopg_pool.ConnectionPool opened in __init__, so each
+    connection() call checks out a warm, vector-registered connection instead of paying
+    the TCP/auth handshake. Pool sizes come from the config (PG_POOL_MIN/PG_POOL_MAX/
+    PG_POOL_TIMEOUT); min_size/max_size override them per manager. Call close(), or use
+    the manager as a context manager, when done.
     """
 
-    def __init__(self, config: PgVectorConnectionConfig) -> None:
+    def __init__(
+        self,
+        config: PgVectorConnectionConfig,
+        *,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ) -> None:
         self._config = config
-
-    def _connect(self) -> Connection[Any]:
-        conn = psycopg.connect(
-            host=self._config.host,
-            port=self._config.port,
-            dbname=self._config.database,
-            user=self._config.user,
-            password=self._config.password,
+        self._identity_logged = False
+        self._vector_types: Optional[tuple[Optional[TypeInfo], ...]] = None
+        min_size, max_size = _pool_sizes(config, min_size, max_size)
+        # open=True starts the pool's workers without waiting for the first connection.
+        self._pool = ConnectionPool(
+            conninfo=_conninfo(config),
+            min_size=min_size,
+            max_size=max_size,
+            timeout=config.pool_timeout,
+            max_idle=POOL_MAX_IDLE,
+            max_lifetime=POOL_MAX_LIFETIME,
+            kwargs={"prepare_threshold": PREPARE_THRESHOLD},
+            configure=self._configure,
+            open=True,
         )
-        register_vector(conn)
         logger.debug(
-            "Established pgvector connection to %s:%s/%s",
-            self._config.host,
-            self._config.port,
-            self._config.database,
+            "Opened connection pool to %s:%s/%s (min=%s max=%s)",
+            config.host,
+            config.port,
+            config.database,
+            min_size,
+            max_size,
         )
-        return conn
+
+    def __enter__(self) -> "PgVectorConnectionManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _register_vector(self, conn: Connection[Any]) -> None:
+        """
+        Register pgvector's codecs (binary included) on a new connection.
+        register_vector() looks up four types per call, one round trip each; their OIDs
+        are fixed for the database, so they are fetched once per manager and reused.
+        """
+        if register_vector_info is None:
+            register_vector(conn)
+            return
+
+        if self._vector_types is None:
+            self._vector_types = tuple(TypeInfo.fetch(conn, name) for name in VECTOR_TYPE_NAMES)
+        _register_vector_types(conn, self._vector_types)
+
+    def _configure(self, conn: Connection[Any]) -> None:
+        # Runs once per new pooled connection, not per checkout.
+        self._register_vector(conn)
+        if not self._identity_logged and logger.isEnabledFor(logging.DEBUG):
+            # Confirms the target DB once per manager; conn.info needs no extra round trip.
+            info = conn.info
+            logger.debug("DB identity: db=%s addr=%s port=%s", info.dbname, info.hostaddr, info.port)
+            self._identity_logged = True
+
+    def close(self) -> None:
+        self._pool.close()
 
     @contextmanager
     def connection(self) -> Iterator[Connection[Any]]:
-        conn = self._connect()
-        try:
-            logger.debug("Yielding raw connection")
+        # The pool commits on success, rolls back on error and keeps the connection open.
+        with self._pool.connection() as conn:
             yield conn
-            conn.commit()
-            logger.debug("Connection committed successfully")
-        except Exception:
-            logger.exception("Connection context failed; rolling back")
-            conn.rollback()
-            raise
-        finally:
-            logger.debug("Closing connection")
-            conn.close()
 
     @contextmanager
-    def cursor(self) -> Iterator[Cursor[Any]]:
-        with self.connection() as conn:
-            cur = conn.cursor()
-            try:
-                logger.debug("Yielding cursor")
-                yield cur
-            finally:
-                logger.debug("Closing cursor")
-                cur.close()
+    def cursor(self, row_factory: RowFactory[Any] = tuple_row) -> Iterator[Cursor[Any]]:
+        with self.connection() as conn, conn.cursor(row_factory=row_factory) as cur:
+            yield cur
 
 
 QueryParams = Optional[Union[Sequence[Any], Mapping[str, Any]]]
@@ -106,32 +285,287 @@ QueryParams = Optional[Union[Sequence[Any], Mapping[str, Any]]]
 class PgVectorClient:
     """
     Lightweight helper built on top of PgVectorConnectionManager for reusable query execution.
+
+    prepare=None leaves server-side preparation to the pool's prepare_threshold (a SQL
+    string is prepared on its second run on a connection); prepare=True prepares on the
+    first run, prepare=False never. Prepared plans live per pooled connection, which is
+    why the pool keeps its connections open rather than reconnecting per query.
+
+    Rows are plain tuples (tuple_row); pass row_factory=psycopg.rows.dict_row to
+    fetch_*/session() for column-keyed dicts, at the cost of one dict per row.
     """
 
-    def __init__(self, manager: PgVectorConnectionManager) -> None:
+    def __init__(self, manager: PgVectorConnectionManager, *, fetch_size: int = DEFAULT_FETCH_SIZE) -> None:
         self._manager = manager
+        self.fetch_size = fetch_size
 
     @classmethod
     def from_env(cls, dotenv_path: Optional[str] = None) -> "PgVectorClient":
         config = PgVectorConnectionConfig.from_env(dotenv_path)
         return cls(PgVectorConnectionManager(config))
 
-    def execute(self, sql: str, params: QueryParams = None) -> None:
-        logger.debug("Executing SQL (no fetch): %s", sql)
-        with self._manager.cursor() as cur:
-            cur.execute(sql, params)
+    @contextmanager
+    def session(self, row_factory: RowFactory[Any] = tuple_row) -> Iterator[Cursor[Any]]:
+        """
+        Check out one pooled connection and yield a cursor to reuse across several queries:
+        `with client.session() as cur: client.execute(sql, params, cur=cur)`.
+        The transaction commits when the block exits cleanly.
+        """
+        with self._manager.connection() as conn, conn.cursor(row_factory=row_factory) as cur:
+            yield cur
 
-    def fetch_one(self, sql: str, params: QueryParams = None) -> Any:
-        logger.debug("Executing SQL fetch_one: %s", sql)
-        with self._manager.cursor() as cur:
+    @contextmanager
+    def pipeline(self) -> Iterator[Cursor[Any]]:
+        """
+        Like session(), but in pipeline mode (needs libpq >= 14): statements executed on
+        the cursor are queued and sent without waiting for each reply, then synced when
+        the block exits. A fetch_* call forces a sync of
+        everything queued so far, so queue the writes first and fetch at the end.
+        """
+        with self._manager.connection() as conn, conn.pipeline(), conn.cursor() as cur:
+            yield cur
+
+    def execute(
+        self,
+        sql: str,
+        params: QueryParams = None,
+        *,
+        cur: Optional[Cursor[Any]] = None,
+        prepare: Optional[bool] = None,
+    ) -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing SQL (no fetch): %s", sql)
+        if cur is not None:
+            cur.execute(sql, params, prepare=prepare)
+            return
+        with self.session() as cur:
+            cur.execute(sql, params, prepare=prepare)
+
+    def execute_many(
+        self, sql: str, params_seq: Iterable[QueryParams], *, cur: Optional[Cursor[Any]] = None
+    ) -> None:
+        """Run one statement for each parameter set; psycopg pipelines executemany()."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing SQL executemany: %s", sql)
+        if cur is not None:
+            cur.executemany(sql, params_seq)
+            return
+        with self.session() as cur:
+            cur.executemany(sql, params_seq)
+
+    def copy_rows(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        *,
+        types: Optional[Sequence[str]] = None,
+        cur: Optional[Cursor[Any]] = None,
+    ) -> None:
+        """
+        Bulk-load rows with COPY FROM STDIN, skipping per-row parse/plan and round trips.
+        Passing the Postgres type names of the columns (e.g. "int8", "text", "vector")
+        switches to binary COPY, which needs them to encode each value.
+        """
+        statement = SQL("COPY {} ({}) FROM STDIN{}").format(
+            Identifier(*table.split(".")),
+            SQL(", ").join(map(Identifier, columns)),
+            SQL(" WITH (FORMAT BINARY)" if types else ""),
+        )
+        if cur is None:
+            with self.session() as cur:
+                self._copy(cur, statement, rows, types)
+        else:
+            self._copy(cur, statement, rows, types)
+
+    @staticmethod
+    def _copy(
+        cur: Cursor[Any], statement: Composed, rows: Iterable[Sequence[Any]], types: Optional[Sequence[str]]
+    ) -> None:
+        count = 0
+        with cur.copy(statement) as copy:
+            if types:
+                copy.set_types(types)
+            write_row = copy.write_row
+            for row in rows:
+                write_row(row)
+                count += 1
+        logger.debug("Copied %s rows", count)
+
+    def fetch_one(
+        self,
+        sql: str,
+        params: QueryParams = None,
+        *,
+        cur: Optional[Cursor[Any]] = None,
+        prepare: Optional[bool] = None,
+        row_factory: RowFactory[Any] = tuple_row,
+    ) -> Any:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing SQL fetch_one: %s", sql)
+        if cur is not None:
+            return cur.execute(sql, params, prepare=prepare).fetchone()
+        with self.session(row_factory) as cur:
+            return cur.execute(sql, params, prepare=prepare).fetchone()
+
+    def iter_rows(
+        self,
+        sql: str,
+        params: QueryParams = None,
+        *,
+        fetch_size: Optional[int] = None,
+        row_factory: RowFactory[Any] = tuple_row,
+    ) -> Iterator[Any]:
+        """
+        Stream a potentially large result through a server-side (named) cursor, fetching
+        `fetch_size` rows (default: the client's fetch_size) per round trip. Prefer
+        fetch_all for small results; the DECLARE/FETCH round trips only pay off when the
+        result is large.
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing SQL iter_rows: %s", sql)
+        with self._manager.connection() as conn, conn.cursor(name="pgvector_client_iter", row_factory=row_factory) as cur:
+            size = fetch_size or self.fetch_size
+            cur.arraysize = size
             cur.execute(sql, params)
-            return cur.fetchone()
+            while rows := cur.fetchmany(size):
+                yield from rows
+
+    def fetch_all(
+        self,
+        sql: str,
+        params: QueryParams = None,
+        *,
+        cur: Optional[Cursor[Any]] = None,
+        prepare: Optional[bool] = None,
+        row_factory: RowFactory[Any] = tuple_row,
+        expected_rows: Optional[int] = None,
+    ) -> Sequence[Any]:
+        """
+        Return every row. Pass expected_rows when the result may be large: from
+        SERVER_SIDE_MIN_ROWS up, rows are pulled fetch_size at a time through a
+        server-side cursor (as iter_rows) instead of one client-side result.
+        """
+        if expected_rows is not None and expected_rows >= SERVER_SIDE_MIN_ROWS and cur is None:
+            return list(self.iter_rows(sql, params, row_factory=row_factory))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing SQL fetch_all: %s", sql)
+        if cur is not None:
+            return cur.execute(sql, params, prepare=prepare).fetchall()
+        with self.session(row_factory) as cur:
+            return cur.execute(sql, params, prepare=prepare).fetchall()
+
+
+class AsyncPgVectorConnectionManager:
+    """
+    asyncio counterpart of PgVectorConnectionManager over a psycopg_pool.AsyncConnectionPool,
+    so many queries can be in flight on one event loop instead of one per blocked thread.
+    Async pools must be opened inside a running loop: use `async with` or await open().
+    """
 
-    def fetch_all(self, sql: str, params: QueryParams = None) -> Sequence[Any]:
-        logger.debug("Executing SQL fetch_all: %s", sql)
-        with self._manager.cursor() as cur:
-            cur.execute(sql, params)
-            return cur.fetchall()
+    def __init__(
+        self,
+        config: PgVectorConnectionConfig,
+        *,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ) -> None:
+        self._config = config
+        self._vector_types: Optional[tuple[Optional[TypeInfo], ...]] = None
+        min_size, max_size = _pool_sizes(config, min_size, max_size)
+        self._pool = AsyncConnectionPool(
+            conninfo=_conninfo(config),
+            min_size=min_size,
+            max_size=max_size,
+            timeout=config.pool_timeout,
+            max_idle=POOL_MAX_IDLE,
+            max_lifetime=POOL_MAX_LIFETIME,
+            kwargs={"prepare_threshold": PREPARE_THRESHOLD},
+            configure=self._configure,
+            open=False,
+        )
+
+    async def __aenter__(self) -> "AsyncPgVectorConnectionManager":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def _configure(self, conn: AsyncConnection[Any]) -> None:
+        # Same once-per-manager TypeInfo caching as the sync manager's _register_vector.
+        if register_vector_info is None:
+            await register_vector_async(conn)
+            return
+
+        if self._vector_types is None:
+            self._vector_types = tuple([await TypeInfo.fetch(conn, name) for name in VECTOR_TYPE_NAMES])
+        _register_vector_types(conn, self._vector_types)
+
+    async def open(self) -> None:
+        await self._pool.open()
+        logger.debug(
+            "Opened async connection pool to %s:%s/%s",
+            self._config.host,
+            self._config.port,
+            self._config.database,
+        )
+
+    async def close(self) -> None:
+        await self._pool.close()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[AsyncConnection[Any]]:
+        async with self._pool.connection() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def cursor(self, row_factory: AsyncRowFactory[Any] = tuple_row) -> AsyncIterator[AsyncCursor[Any]]:
+        async with self.connection() as conn, conn.cursor(row_factory=row_factory) as cur:
+            yield cur
+
+
+class AsyncPgVectorClient:
+    """
+    asyncio counterpart of PgVectorClient; each call checks out a pooled connection.
+    """
+
+    def __init__(self, manager: AsyncPgVectorConnectionManager) -> None:
+        self._manager = manager
+
+    async def execute(self, sql: str, params: QueryParams = None, *, prepare: Optional[bool] = None) -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing SQL (no fetch, async): %s", sql)
+        async with self._manager.cursor() as cur:
+            await cur.execute(sql, params, prepare=prepare)
+
+    async def fetch_one(
+        self,
+        sql: str,
+        params: QueryParams = None,
+        *,
+        prepare: Optional[bool] = None,
+        row_factory: AsyncRowFactory[Any] = tuple_row,
+    ) -> Any:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing SQL fetch_one (async): %s", sql)
+        async with self._manager.cursor(row_factory) as cur:
+            await cur.execute(sql, params, prepare=prepare)
+            return await cur.fetchone()
+
+    async def fetch_all(
+        self,
+        sql: str,
+        params: QueryParams = None,
+        *,
+        prepare: Optional[bool] = None,
+        row_factory: AsyncRowFactory[Any] = tuple_row,
+    ) -> Sequence[Any]:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Executing SQL fetch_all (async): %s", sql)
+        async with self._manager.cursor(row_factory) as cur:
+            await cur.execute(sql, params, prepare=prepare)
+            return await cur.fetchall()
 
 
 def main(dotenv_path: Optional[str] = None) -> None:
@@ -141,33 +575,34 @@ def main(dotenv_path: Optional[str] = None) -> None:
     logging.basicConfig(level=logging.INFO)
     try:
         config = PgVectorConnectionConfig.from_env(dotenv_path)
-        manager = PgVectorConnectionManager(config)
-        client = PgVectorClient(manager)
-
-        with manager.connection() as conn:
-            info = getattr(conn, "info", None)
-            if info:
-                logger.info(
-                    "Connection established via manager: host=%s port=%s db=%s",
-                    info.host,
-                    info.port,
-                    info.dbname,
-                )
-            else:
-                logger.info("Connection established via manager.")
-
-        with manager.cursor() as cur:
-            cur.execute("SELECT 'cursor test' AS message;")
-            logger.info("Cursor test result: %s", cur.fetchone())
-
-        client.execute("SELECT 1;")
-        logger.info("Client execute() completed for SELECT 1.")
-
-        single = client.fetch_one("SELECT 42 AS value;")
-        logger.info("Client fetch_one() result: %s", single)
-
-        rows = client.fetch_all("SELECT generate_series(1, 3) AS value;")
-        logger.info("Client fetch_all() results: %s", rows)
+        with PgVectorConnectionManager(config, max_size=1) as manager:
+            client = PgVectorClient(manager)
+
+            with manager.connection() as conn:
+                info = getattr(conn, "info", None)
+                if info:
+                    logger.info(
+                        "Connection established via manager: host=%s port=%s db=%s",
+                        info.host,
+                        info.port,
+                        info.dbname,
+                    )
+                else:
+                    logger.info("Connection established via manager.")
+
+            with manager.cursor() as cur:
+                cur.execute("SELECT 'cursor test' AS message;")
+                logger.info("Cursor test result: %s", cur.fetchone())
+
+            client.execute("SELECT 1;")
+            logger.info("Client execute() completed for SELECT 1.")
+
+            with client.session() as cur:
+                single = client.fetch_one("SELECT 42 AS value;", cur=cur)
+                logger.info("Client fetch_one() result: %s", single)
+
+                rows = client.fetch_all("SELECT generate_series(1, 3) AS value;", cur=cur)
+                logger.info("Client fetch_all() results: %s", rows)
 
         logger.info("All PgVector connection helpers executed successfully.")
     except Exception:
@@ -179,6 +614,8 @@ __all__ = [
     "PgVectorConnectionConfig",
     "PgVectorConnectionManager",
     "PgVectorClient",
+    "AsyncPgVectorConnectionManager",
+    "AsyncPgVectorClient",
     "main",
 ]
 
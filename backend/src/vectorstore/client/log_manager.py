@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import os
 import sys
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Iterator, Mapping, Sequence
 
-from src.vectorstore.db_queries.queries import INSERT_LOG_MASTER
+from src.vectorstore.db_queries.queries import INSERT_LOG_MASTER, UPDATE_LOG_MASTER_STATUS
 from src.vectorstore.client.connection import (
     PgVectorConnectionConfig,
     PgVectorConnectionManager,
@@ -14,6 +17,19 @@ from src.vectorstore.client.connection import (
 
 logger = logging.getLogger(__name__)
 DEFAULT_DATA_DIR = Path(__file__).resolve().parents[3] / "data" / "raw"
+COUNT_CHUNK_SIZE = 1 << 20
+SCAN_MAX_WORKERS = 8
+
+
+@lru_cache(maxsize=4)
+def _get_manager(dotenv_path: str | None = None) -> PgVectorConnectionManager:
+    # Shared pooled manager per dotenv file: env parsing and the connection handshake
+    # happen once per process instead of once per ingest call.
+    config = PgVectorConnectionConfig.from_env(dotenv_path)
+    manager = PgVectorConnectionManager(config)
+    atexit.register(manager.close)
+    logger.info("Connecting to %s:%s/%s", config.host, config.port, config.database)
+    return manager
 
 
 # ============================================================
@@ -31,11 +47,9 @@ def insert_log_master(
     environment: str = "dev",
     source_type: str = "file",
     log_format: str = "otel",
+    commit: bool = True,
 ) -> int:
 
-    # Use explicit UTC timezone to avoid deprecated naive UTC datetimes
-    now = datetime.now(timezone.utc)
-
     params = {
         "source_name": source_name,
         "source_type": source_type,
@@ -46,8 +60,6 @@ def insert_log_master(
         "byte_size": byte_size,
         "parse_status": parse_status,
         "parse_error": parse_error,
-        "parsed_at": now,
-        "created_at": now,
     }
 
     logger.debug(
@@ -56,18 +68,88 @@ def insert_log_master(
     )
 
     with conn.cursor() as cur:
-        # Debug: confirm target DB so we never write to wrong DB again
-        cur.execute("SELECT current_database(), inet_server_addr(), inet_server_port()")
-        print("DB Identity →", cur.fetchone())
-
-        cur.execute(INSERT_LOG_MASTER, params)
+        cur.execute(INSERT_LOG_MASTER, params, prepare=True)
         master_id = cur.fetchone()[0]
 
-    conn.commit()
-    print("Inserted log_master.id =", master_id)
+    if commit:
+        conn.commit()
     return master_id
 
 
+def insert_log_masters(
+    conn,
+    summaries: Sequence[Mapping[str, Any]],
+    *,
+    environment: str = "dev",
+    source_type: str = "file",
+    log_format: str = "otel",
+    commit: bool = True,
+) -> list[int]:
+    """
+    Insert one log_master row per summary (source_name, line_count, byte_size) with a
+    single executemany; psycopg pipelines the statements and returns ids in input order.
+    """
+
+    if not summaries:
+        return []
+
+    params_list = [
+        {
+            "source_name": summary["source_name"],
+            "source_type": source_type,
+            "service_name": summary.get("service_name"),
+            "environment": environment,
+            "log_format": log_format,
+            "line_count": summary["line_count"],
+            "byte_size": summary["byte_size"],
+            "parse_status": summary.get("parse_status", "SUCCESS"),
+            "parse_error": summary.get("parse_error"),
+        }
+        for summary in summaries
+    ]
+
+    master_ids: list[int] = []
+    with conn.cursor() as cur:
+        cur.executemany(INSERT_LOG_MASTER, params_list, returning=True)
+        while True:
+            master_ids.append(cur.fetchone()[0])
+            if not cur.nextset():
+                break
+
+    if commit:
+        conn.commit()
+    return master_ids
+
+
+def update_log_master_status(
+    conn,
+    master_id: int,
+    *,
+    line_count: int,
+    parse_status: str,
+    parse_error: str | None = None,
+    commit: bool = True,
+) -> None:
+    """
+    Record the final line count and status of a log_master row inserted up front
+    (e.g. as IN_PROGRESS while its events are streamed).
+    """
+
+    with conn.cursor() as cur:
+        cur.execute(
+            UPDATE_LOG_MASTER_STATUS,
+            {
+                "id": master_id,
+                "line_count": line_count,
+                "parse_status": parse_status,
+                "parse_error": parse_error,
+            },
+        )
+
+    if commit:
+        conn.commit()
+
+
 # ============================================================
 # Insert using parsed metadata dict
 # ============================================================
@@ -92,6 +174,42 @@ def insert_parsed_log_master(conn, parsed_data: Mapping[str, Any]) -> int:
     )
 
 
+def _iter_log_files(root: str | os.PathLike[str], suffix: str = ".log") -> Iterator[str]:
+    """
+    Depth-first os.scandir walk yielding matching file paths as they are found.
+    Entries are sorted per directory, so the order is deterministic without first
+    materializing the whole tree.
+    """
+
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        subdirs: list[str] = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name.endswith(suffix) and entry.is_file():
+                yield entry.path
+        stack.extend(reversed(subdirs))
+
+
+def _scan_file(path: str | Path) -> tuple[int, int]:
+    # One open for the summary: size from fstat, newlines counted over raw 1 MiB blocks
+    # with no decoding or per-line Python work.
+    count = 0
+    last = b"\n"
+    with open(path, "rb") as handle:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        byte_size = os.fstat(handle.fileno()).st_size
+        while chunk := handle.read(COUNT_CHUNK_SIZE):
+            count += chunk.count(b"\n")
+            last = chunk[-1:]
+    # A final line without a trailing newline still counts, as with line iteration.
+    return count + (last != b"\n"), byte_size
+
+
 def ingest_log_file(
     conn,
     file_path: Path | str,
@@ -105,11 +223,7 @@ def ingest_log_file(
     """
 
     path = Path(file_path)
-    byte_size = path.stat().st_size
-
-    # Count lines without holding them in memory
-    with path.open("r", encoding="utf-8", errors="ignore") as handle:
-        line_count = sum(1 for _ in handle)
+    line_count, byte_size = _scan_file(path)
 
     master_id = insert_log_master(
         conn,
@@ -131,15 +245,7 @@ def ingest_log_file(
 # ============================================================
 def insert_log_master_from_env(parsed_data: Mapping[str, Any], dotenv_path: str | None = None) -> int:
 
-    config = PgVectorConnectionConfig.from_env(dotenv_path)
-    manager = PgVectorConnectionManager(config)
-
-    print(
-        f"Opening connection via env → host={config.host} "
-        f"port={config.port} db={config.database}"
-    )
-
-    with manager.connection() as conn:
+    with _get_manager(dotenv_path).connection() as conn:
         return insert_parsed_log_master(conn, parsed_data)
 
 
@@ -155,12 +261,7 @@ def ingest_log_file_from_env(
     Scan + insert a single log file using connection details from environment variables.
     """
 
-    config = PgVectorConnectionConfig.from_env(dotenv_path)
-    manager = PgVectorConnectionManager(config)
-
-    logger.info("Connecting to %s:%s/%s", config.host, config.port, config.database)
-
-    with manager.connection() as conn:
+    with _get_manager(dotenv_path).connection() as conn:
         return ingest_log_file(
             conn,
             file_path,
@@ -186,29 +287,33 @@ def ingest_all_logs_from_env(
     if not root.exists():
         raise FileNotFoundError(f"Log directory does not exist: {root}")
 
-    log_files = sorted(root.rglob("*.log"))
-    if not log_files:
+    def _summarize(file_path: str) -> dict[str, Any]:
+        line_count, byte_size = _scan_file(file_path)
+        return {"source_name": os.path.basename(file_path), "line_count": line_count, "byte_size": byte_size}
+
+    # Files are submitted to the scan workers as the walk discovers them, so reading
+    # starts before traversal finishes; map() keeps file order.
+    max_workers = min(SCAN_MAX_WORKERS, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="log-scan") as executor:
+        summaries = list(executor.map(_summarize, _iter_log_files(root)))
+
+    if not summaries:
         logger.info("No .log files found under %s", root)
         return []
 
-    config = PgVectorConnectionConfig.from_env(dotenv_path)
-    manager = PgVectorConnectionManager(config)
-    logger.info("Connecting to %s:%s/%s", config.host, config.port, config.database)
-
-    inserted: list[int] = []
-    with manager.connection() as conn:
-        for file_path in log_files:
-            logger.info("Processing %s", file_path)
-            master_id = ingest_log_file(
-                conn,
-                file_path,
-                environment=environment,
-                source_type=source_type,
-                log_format=log_format,
-            )
-            inserted.append(master_id)
-            logger.info("Inserted log_master id=%s for %s", master_id, file_path.name)
+    # Every row goes in with one executemany instead of a round trip per file.
+    with _get_manager(dotenv_path).connection() as conn:
+        inserted = insert_log_masters(
+            conn,
+            summaries,
+            environment=environment,
+            source_type=source_type,
+            log_format=log_format,
+            commit=False,
+        )
 
+    for master_id, summary in zip(inserted, summaries):
+        logger.info("Inserted log_master id=%s for %s", master_id, summary["source_name"])
     return inserted
 
 
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Mapping, List
 
+from psycopg.types.json import Jsonb
+
 # DB queries
-from src.vectorstore.db_queries.queries import INSERT_LOG_MASTER, INSERT_LOG_EVENT
+from src.vectorstore.db_queries.queries import INSERT_LOG_MASTER, COPY_LOG_EVENT
+
+from src.vectorstore.parser.log_parser import LogParser
 
 # DB connection
 from src.vectorstore.client.connection import (
@@ -33,10 +36,9 @@ def insert_log_master(
     environment: str = "dev",
     source_type: str = "file",
     log_format: str = "otel",
+    commit: bool = True,
 ) -> int:
 
-    now = datetime.now(timezone.utc)
-
     params = {
         "source_name": source_name,
         "source_type": source_type,
@@ -47,55 +49,49 @@ def insert_log_master(
         "byte_size": byte_size,
         "parse_status": parse_status,
         "parse_error": parse_error,
-        "parsed_at": now,
-        "created_at": now,
     }
 
     with conn.cursor() as cur:
-        cur.execute("SELECT current_database(), inet_server_addr(), inet_server_port()")
-        print("DB Identity →", cur.fetchone())
-
-        cur.execute(INSERT_LOG_MASTER, params)
+        cur.execute(INSERT_LOG_MASTER, params, prepare=True)
         master_id = cur.fetchone()[0]
 
-    conn.commit()
-    print("Inserted log_master.id =", master_id)
+    if commit:
+        conn.commit()
     return master_id
 
 
 # ============================================================
 # INSERT INTO log_event
 # ============================================================
-def insert_log_events(conn, master_id: int, entries: List[Any]):
-    now = datetime.now(timezone.utc)
-    rows = []
-
-    for e in entries:
-        f = e.fields
-
-        rows.append({
-            "master_id": master_id,
-            "ts": f.get("timestamp"),
-            "service_name": f.get("service"),
-            "level": f.get("level"),
-            "trace_id": f.get("trace_id"),
-            "span_id": f.get("span_id"),
-            "message": f.get("msg"),
-            "raw_line": e.raw,
-            "metadata": f,
-            "logger_name": f.get("logger"),
-            "thread_name": f.get("thread"),
-            "exception_type": f.get("exception_type"),
-            "exception_msg": f.get("exception_msg"),
-            "stack_trace": f.get("stack_trace"),
-            "created_at": now,
-        })
-
+def insert_log_events(conn, master_id: int, entries: List[Any], *, commit: bool = True):
+    """
+    Stream parsed entries into log_event with a single COPY instead of one INSERT per row.
+    Text format is used because parsed timestamps are raw strings left for the server to cast.
+    """
     with conn.cursor() as cur:
-        cur.executemany(INSERT_LOG_EVENT, rows)
-
-    conn.commit()
-    print("Inserted log_event rows:", len(entries))
+        with cur.copy(COPY_LOG_EVENT) as copy:
+            for e in entries:
+                f = e.fields
+                copy.write_row((
+                    master_id,
+                    f.get("timestamp"),
+                    f.get("service"),
+                    f.get("level"),
+                    f.get("trace_id"),
+                    f.get("span_id"),
+                    f.get("msg"),
+                    e.raw,
+                    Jsonb(f),
+                    f.get("logger"),
+                    f.get("thread"),
+                    f.get("exception_type"),
+                    f.get("exception_msg"),
+                    f.get("stack_trace"),
+                ))
+
+    if commit:
+        conn.commit()
+    logger.debug("Inserted log_event rows: %s", len(entries))
 
 
 # ============================================================
@@ -103,21 +99,25 @@ def insert_log_events(conn, master_id: int, entries: List[Any]):
 # ============================================================
 def ingest_log_file(conn, file_path: Path):
 
-    print("Parsing:", file_path)
-    entries, metadata = parse_file(file_path)
+    logger.debug("Parsing: %s", file_path)
+    # One pass yields the entries plus line_count/byte_size for log_master.
+    entries, metadata = LogParser().parse_file_with_metadata(file_path)
 
-    print("Parsed entries:", len(entries))
-    print("Metadata:", metadata)
+    logger.debug("Parsed entries: %s", len(entries))
+    logger.debug("Metadata: %s", metadata)
 
+    # Master row and its events share one transaction and a single COMMIT round trip.
     master_id = insert_log_master(
         conn,
         source_name=metadata["source_name"],
         line_count=metadata["line_count"],
         byte_size=metadata["byte_size"],
         parse_status=metadata.get("parse_status", "SUCCESS"),
+        commit=False,
     )
 
-    insert_log_events(conn, master_id, entries)
+    insert_log_events(conn, master_id, entries, commit=False)
+    conn.commit()
 
     return master_id
 
@@ -128,13 +128,12 @@ def ingest_log_file(conn, file_path: Path):
 def run_log_ingest(file_path: str, dotenv_path: str | None = None):
 
     conf = PgVectorConnectionConfig.from_env(dotenv_path)
-    manager = PgVectorConnectionManager(conf)
 
-    print(
-        f"Opening connection → host={conf.host} port={conf.port} db={conf.database}"
+    logger.debug(
+        "Opening connection → host=%s port=%s db=%s", conf.host, conf.port, conf.database
     )
 
-    with manager.connection() as conn:
+    with PgVectorConnectionManager(conf, max_size=1) as manager, manager.connection() as conn:
         return ingest_log_file(conn, Path(file_path))
 
 
@@ -147,7 +146,7 @@ def main(dotenv_path: str | None = None) -> None:
     logging.basicConfig(level=logging.INFO)
 
     config = PgVectorConnectionConfig.from_env(dotenv_path)
-    manager = PgVectorConnectionManager(config)
+    manager = PgVectorConnectionManager(config, max_size=1)
 
     class _Entry:
         def __init__(self, raw: str, fields: Mapping[str, Any]) -> None:
@@ -185,6 +184,8 @@ def main(dotenv_path: str | None = None) -> None:
     except Exception:
         logger.exception("Smoke test failed; ensure DB is reachable and schema is applied")
         raise
+    finally:
+        manager.close()
 
 
 if __name__ == "__main__":
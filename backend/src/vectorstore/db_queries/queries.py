@@ -13,12 +13,23 @@ INSERT INTO log_master (
 VALUES (
     %(source_name)s, %(source_type)s, %(service_name)s, %(environment)s,
     %(log_format)s, %(line_count)s, %(byte_size)s, %(parse_status)s,
-    %(parse_error)s, %(parsed_at)s, %(created_at)s
+    %(parse_error)s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
 )
 RETURNING id;
 """
 
 
+# Final counts/status for a log_master row inserted before its events were streamed.
+UPDATE_LOG_MASTER_STATUS = """
+UPDATE log_master
+   SET line_count = %(line_count)s,
+       parse_status = %(parse_status)s,
+       parse_error = %(parse_error)s,
+       parsed_at = CURRENT_TIMESTAMP
+ WHERE id = %(id)s;
+"""
+
+
 INSERT_LOG_EVENT = """
 INSERT INTO log_event (
     master_id, ts, service_name, level, trace_id, span_id,
@@ -30,11 +41,64 @@ VALUES (
     %(span_id)s, %(message)s, %(raw_line)s, %(metadata)s,
     %(logger_name)s, %(thread_name)s,
     %(exception_type)s, %(exception_msg)s, %(stack_trace)s,
-    %(created_at)s
+    CURRENT_TIMESTAMP
 );
 """
 
 
+# Column order for COPY rows; matches INSERT_LOG_EVENT. created_at is left to the
+# column default (NOW()), as the INSERTs use CURRENT_TIMESTAMP.
+LOG_EVENT_COPY_COLUMNS = (
+    "master_id", "ts", "service_name", "level", "trace_id", "span_id",
+    "message", "raw_line", "metadata", "logger_name", "thread_name",
+    "exception_type", "exception_msg", "stack_trace",
+)
+
+COPY_LOG_EVENT = f"""
+COPY log_event ({", ".join(LOG_EVENT_COPY_COLUMNS)}) FROM STDIN
+"""
+
+# Same columns plus embedding, as binary COPY; values must match these types in order.
+LOG_EVENT_EMBEDDED_COPY_COLUMNS = LOG_EVENT_COPY_COLUMNS + ("embedding",)
+LOG_EVENT_EMBEDDED_COPY_TYPES = (
+    "int8", "timestamptz", "text", "text", "text", "text",
+    "text", "text", "jsonb", "text", "text",
+    "text", "text", "text", "halfvec",
+)
+
+COPY_LOG_EVENT_EMBEDDED_BINARY = f"""
+COPY log_event ({", ".join(LOG_EVENT_EMBEDDED_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT BINARY)
+"""
+
+
+# Bulk (bootstrap) ingest: rows are COPYed into an UNLOGGED staging table, which skips
+# WAL, then moved into log_event with one INSERT ... SELECT in the same transaction.
+LOG_EVENT_STAGE_TABLE = "log_event_stage"
+
+CREATE_LOG_EVENT_STAGE = """
+CREATE UNLOGGED TABLE IF NOT EXISTS log_event_stage (LIKE log_event INCLUDING DEFAULTS);
+"""
+
+TRUNCATE_LOG_EVENT_STAGE = """
+TRUNCATE log_event_stage;
+"""
+
+FLUSH_LOG_EVENT_STAGE = """
+INSERT INTO log_event SELECT * FROM log_event_stage;
+"""
+
+DROP_LOG_EVENT_EMBEDDING_INDEX = """
+DROP INDEX IF EXISTS idx_log_event_embedding_hnsw;
+"""
+
+# Must match backend/infra/docker/postgres/init/01_pgvector_setup.sql.
+CREATE_LOG_EVENT_EMBEDDING_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_log_event_embedding_hnsw
+    ON log_event USING hnsw (embedding halfvec_ip_ops)
+    WITH (m = 16, ef_construction = 64);
+"""
+
+
 def main() -> None:
     """
     Smoke test to log the available SQL templates for quick inspection.
@@ -42,7 +106,10 @@ def main() -> None:
 
     logging.basicConfig(level=logging.INFO)
     logger.info("INSERT_LOG_MASTER SQL:\n%s", INSERT_LOG_MASTER.strip())
+    logger.info("UPDATE_LOG_MASTER_STATUS SQL:\n%s", UPDATE_LOG_MASTER_STATUS.strip())
     logger.info("INSERT_LOG_EVENT SQL:\n%s", INSERT_LOG_EVENT.strip())
+    logger.info("COPY_LOG_EVENT SQL:\n%s", COPY_LOG_EVENT.strip())
+    logger.info("COPY_LOG_EVENT_EMBEDDED_BINARY SQL:\n%s", COPY_LOG_EVENT_EMBEDDED_BINARY.strip())
     logger.info("SQL templates loaded successfully.")
 
 
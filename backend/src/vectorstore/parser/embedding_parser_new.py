@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-import json
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
-from typing import Callable, Iterable, Sequence
+from typing import Any, Callable, Iterable, Sequence
 
+import numpy as np
+import orjson
+import torch
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 try:
@@ -16,13 +22,22 @@ except ImportError:
 from datetime import datetime, timezone
 from typing import Sequence
 
-from psycopg.types.json import Json
+from psycopg import sql
+from psycopg.types.json import set_json_dumps
 
 from src.vectorstore.client.connection import (
     PgVectorConnectionConfig,
     PgVectorConnectionManager,
 )
 from src.vectorstore.client.log_manager import insert_log_master
+from src.vectorstore.db_queries.queries import (
+    CREATE_LOG_EVENT_EMBEDDING_INDEX,
+    CREATE_LOG_EVENT_STAGE,
+    DROP_LOG_EVENT_EMBEDDING_INDEX,
+    FLUSH_LOG_EVENT_STAGE,
+    LOG_EVENT_STAGE_TABLE,
+    TRUNCATE_LOG_EVENT_STAGE,
+)
 from src.vectorstore.parser.log_parser import LogParser, ParsedLogEntry
 
 # ============================================================
@@ -32,6 +47,14 @@ from src.vectorstore.parser.log_parser import LogParser, ParsedLogEntry
 DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"  # 384 dims
 EMBEDDING_DIMS = 384
 EMBEDDING_DATA_DIR = Path(__file__).resolve().parent.parent / "embedding_data"
+CACHE_VECTOR_DTYPE = np.float16
+# Below this many messages a process pool costs more than it saves.
+SPLIT_PARALLEL_MIN_SOURCES = 20_000
+SPLIT_PARALLEL_CHUNKSIZE = 512
+INDEX_BUILD_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+
+# Let the fast tokenizer use its thread pool for the large cross-file batches.
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
 
 _EMBEDDERS: dict[str, HuggingFaceEmbeddings] = {}
 
@@ -58,28 +81,48 @@ def _embedding_json_path(source: Path) -> Path:
     return EMBEDDING_DATA_DIR / f"{source.stem}.json"
 
 
+def _embedding_vectors_path(json_path: Path) -> Path:
+    return json_path.with_suffix(".npy")
+
+
 def _load_cached_embeddings(
     json_path: Path,
-) -> tuple[list[str], list[list[float]]] | None:
+) -> tuple[list[str], np.ndarray] | None:
+    """
+    Load a cached embedding run: chunks from the JSON manifest, vectors from the
+    binary .npy sidecar, upcast to float32 (older caches kept the vectors inline in the JSON).
+    """
     if not json_path.exists():
         return None
 
     try:
-        payload = json.loads(json_path.read_text(encoding="utf-8"))
+        payload = orjson.loads(json_path.read_bytes())
     except Exception as exc:
         logging.warning("Failed to read cached embeddings %s: %s", json_path, exc)
         return None
 
     chunks = payload.get("chunks")
-    vectors = payload.get("vectors")
-
-    if not isinstance(chunks, list) or not isinstance(vectors, list):
+    if not isinstance(chunks, list):
         return None
 
-    if len(chunks) != len(vectors):
+    vectors_path = _embedding_vectors_path(json_path)
+    if vectors_path.exists():
+        try:
+            matrix = np.load(vectors_path).astype(np.float32, copy=False)
+        except Exception as exc:
+            logging.warning("Failed to read cached vectors %s: %s", vectors_path, exc)
+            return None
+    else:
+        vectors = payload.get("vectors")
+        if not isinstance(vectors, list):
+            return None
+        matrix = np.asarray(vectors, dtype=np.float32)
+
+    if matrix.ndim != 2 or matrix.shape[0] != len(chunks):
         raise ValueError("Cached chunks/vectors length mismatch")
 
-    return [str(c) for c in chunks], [list(map(float, v)) for v in vectors]
+    # Chunks were written by the splitter and json already decoded them as str.
+    return chunks, matrix
 
 
 def _store_embeddings_json(
@@ -94,18 +137,27 @@ def _store_embeddings_json(
 ) -> None:
     json_path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Vectors go to a binary .npy (float16: normalized embeddings lose nothing that
+    # matters for retrieval, at half the disk and read bandwidth); the JSON manifest only
+    # holds chunks and metadata, and is written last so a partial run is never used.
+    matrix = np.asarray(vectors, dtype=CACHE_VECTOR_DTYPE)
+    vectors_path = _embedding_vectors_path(json_path)
+    np.save(vectors_path, matrix)
+
     payload = {
         "source": str(source_path),
         "model_name": model_name,
         "chunk_size": chunk_size,
         "chunk_overlap": chunk_overlap,
         "vector_dims": EMBEDDING_DIMS,
+        "vectors_file": vectors_path.name,
+        "vectors_shape": list(matrix.shape),
+        "vectors_dtype": str(matrix.dtype),
         "created_at": datetime.now(timezone.utc).isoformat(),
         "chunks": list(chunks),
-        "vectors": [list(map(float, v)) for v in vectors],
     }
 
-    json_path.write_text(json.dumps(payload), encoding="utf-8")
+    json_path.write_bytes(orjson.dumps(payload))
 
 
 def _get_embedder(model_name: str) -> HuggingFaceEmbeddings:
@@ -118,12 +170,18 @@ def _get_embedder(model_name: str) -> HuggingFaceEmbeddings:
             model_kwargs={"device": "cuda"},
             **_DEFAULT_EMBED_KWARGS,
         )
+        # Half precision roughly doubles CUDA throughput; normalized retrieval
+        # embeddings are unaffected in practice.
+        embedder.client.half()
     except Exception:
         embedder = HuggingFaceEmbeddings(
             model_name=model_name,
             model_kwargs={"device": "cpu"},
             **_DEFAULT_EMBED_KWARGS,
         )
+        if os.environ.get("EMBED_CPU_BF16") == "1":
+            # Only worth it on CPUs with native bf16 (AVX512-BF16 / AMX).
+            embedder.client.to(torch.bfloat16)
 
     _EMBEDDERS[model_name] = embedder
     return embedder
@@ -133,6 +191,58 @@ def _get_embedder(model_name: str) -> HuggingFaceEmbeddings:
 # EMBEDDING PIPELINE
 # ============================================================
 
+def _split_messages(
+    sources: Iterable[str],
+    *,
+    chunk_size: int,
+    chunk_overlap: int,
+    separators: Sequence[str] | None = None,
+) -> list[str]:
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=separators,
+    )
+
+    sources = list(sources)
+    workers = os.cpu_count() or 1
+    if len(sources) < SPLIT_PARALLEL_MIN_SOURCES or workers < 2:
+        chunks: list[str] = []
+        for item in sources:
+            chunks.extend(splitter.split_text(item))
+        return chunks
+
+    # Splitting is pure-Python string work, so large inputs go to worker processes;
+    # map() keeps source order, which the per-file offsets rely on.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(splitter.split_text, sources, chunksize=SPLIT_PARALLEL_CHUNKSIZE)
+        return list(chain.from_iterable(results))
+
+
+def _embed_chunks(
+    chunks: Sequence[str],
+    *,
+    model_name: str,
+    embed_batch_size: int,
+    progress_callback: Callable[[int, int, str | None], None] | None = None,
+) -> list[list[float]]:
+    embedder = _get_embedder(model_name)
+    vectors: list[list[float]] = []
+
+    total = len(chunks)
+    with torch.inference_mode():
+        for start in range(0, total, embed_batch_size):
+            end = min(start + embed_batch_size, total)
+            batch = list(chunks[start:end])
+            batch_vectors = embedder.embed_documents(batch)
+            vectors.extend(batch_vectors)
+
+            if progress_callback:
+                progress_callback(end, total, None)
+
+    return vectors
+
+
 def embed_with_recursive_splitter(
     text: str | Iterable[str],
     *,
@@ -144,34 +254,23 @@ def embed_with_recursive_splitter(
     progress_callback: Callable[[int, int, str | None], None] | None = None,
 ) -> tuple[list[str], list[list[float]]]:
 
-    splitter = RecursiveCharacterTextSplitter(
+    sources = [text] if isinstance(text, str) else list(text)
+    chunks = _split_messages(
+        sources,
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         separators=separators,
     )
 
-    sources = [text] if isinstance(text, str) else list(text)
-
-    chunks: list[str] = []
-    for item in sources:
-        chunks.extend(splitter.split_text(item))
-
     if not chunks:
         return [], []
 
-    embedder = _get_embedder(model_name)
-    vectors: list[list[float]] = []
-
-    total = len(chunks)
-    for start in range(0, total, embed_batch_size):
-        end = min(start + embed_batch_size, total)
-        batch = chunks[start:end]
-        batch_vectors = embedder.embed_documents(batch)
-        vectors.extend(batch_vectors)
-
-        if progress_callback:
-            progress_callback(end, total, None)
-
+    vectors = _embed_chunks(
+        chunks,
+        model_name=model_name,
+        embed_batch_size=embed_batch_size,
+        progress_callback=progress_callback,
+    )
     return chunks, vectors
 
 
@@ -179,64 +278,67 @@ def embed_with_recursive_splitter(
 # DATABASE INSERT (pgvector-native)
 # ============================================================
 
+_EMBEDDED_EVENT_COPY = sql.SQL("""
+    COPY {table} (master_id, message, raw_line, embedding, metadata)
+    FROM STDIN
+""")
+
+
+_CHUNK_METADATA = '{{"chunk_index":{}}}'
+
+
+def _passthrough_json(obj: str) -> str:
+    return obj
+
+
+def _vector_text(vector: Sequence[float]) -> str:
+    return "[" + ",".join(map(str, vector)) + "]"
+
+
 def insert_log_events(
     conn,
     master_id: int,
     chunks: Sequence[str],
-    vectors: Sequence[Sequence[float]],
+    vectors: Sequence[Sequence[float]] | np.ndarray,
     *,
-    batch_size: int = 500,
+    table: str = "log_event",
+    commit: bool = True,
 ) -> int:
     """
-    Insert embedded chunks into log_event.embedding (vector(384))
-    using psycopg v3 native executemany.
+    Stream embedded chunks into log_event.embedding (halfvec(384)) with a single COPY.
+    Uses binary COPY when pgvector's types are registered on the connection, otherwise
+    falls back to text COPY with vector literals. ``table`` may name a staging table
+    with the same columns.
     """
 
-    assert len(chunks) == len(vectors), "Chunks/vectors mismatch"
-
-    sql = """
-        INSERT INTO log_event (
-            master_id,
-            message,
-            raw_line,
-            embedding,
-            metadata,
-            created_at
-        )
-        VALUES (
-            %(master_id)s,
-            %(message)s,
-            %(raw_line)s,
-            %(embedding)s,
-            %(metadata)s,
-            %(created_at)s
-        )
-    """
+    if len(chunks) != len(vectors):
+        raise ValueError(f"Chunks/vectors mismatch: {len(chunks)} chunks, {len(vectors)} vectors")
 
-    now = datetime.now(timezone.utc)
-    inserted = 0
+    binary = conn.adapters.types.get("halfvec") is not None
+    # One float32 matrix; pgvector's halfvec binary dumper narrows each row to fp16.
+    matrix = np.asarray(vectors, dtype=np.float32)
 
+    copy_sql = _EMBEDDED_EVENT_COPY.format(table=sql.Identifier(table))
     with conn.cursor() as cur:
-        for start in range(0, len(chunks), batch_size):
-            rows = []
-
-            for i in range(start, min(start + batch_size, len(chunks))):
-                rows.append(
-                    {
-                        "master_id": master_id,
-                        "message": chunks[i],
-                        "raw_line": chunks[i],
-                        "embedding": vectors[i],  # vector(384)
-                        "metadata": Json({"chunk_index": i}),
-                        "created_at": now,
-                    }
-                )
-
-            cur.executemany(sql, rows)
-            inserted += len(rows)
-
-    conn.commit()
-    return inserted
+        # Metadata is rendered straight to JSON text per row; the cursor's jsonb dumper
+        # passes it through instead of allocating and serializing a dict each time.
+        set_json_dumps(_passthrough_json, context=cur)
+        if binary:
+            with cur.copy(copy_sql + sql.SQL(" (FORMAT BINARY)")) as copy:
+                copy.set_types(["int8", "text", "text", "halfvec", "jsonb"])
+                for i, (chunk, vector) in enumerate(zip(chunks, matrix)):
+                    copy.write_row((master_id, chunk, chunk, vector, _CHUNK_METADATA.format(i)))
+        else:
+            logging.warning("pgvector types not registered; falling back to text COPY")
+            with cur.copy(copy_sql) as copy:
+                for i, (chunk, vector) in enumerate(zip(chunks, matrix)):
+                    copy.write_row(
+                        (master_id, chunk, chunk, _vector_text(vector), _CHUNK_METADATA.format(i))
+                    )
+
+    if commit:
+        conn.commit()
+    return len(chunks)
 
 
 # ============================================================
@@ -251,8 +353,16 @@ def _parsed_messages(entries: Sequence[ParsedLogEntry]) -> list[str]:
     return messages
 
 
-def insert_embeddings_for_log_file(
-    file_path: str | Path,
+@dataclass
+class _FileEmbeddings:
+    path: Path
+    parse_metadata: dict[str, Any]
+    chunks: list[str]
+    vectors: np.ndarray | None = None
+
+
+def insert_embeddings_for_log_files(
+    file_paths: Iterable[str | Path],
     *,
     dotenv_path: str | None = ".env",
     environment: str = "dev",
@@ -261,66 +371,154 @@ def insert_embeddings_for_log_file(
     chunk_size: int = 1200,
     chunk_overlap: int = 100,
     model_name: str = DEFAULT_EMBEDDING_MODEL,
-    embed_batch_size: int = 128,
+    embed_batch_size: int = 512,
     progress_callback: Callable[[int, int, str | None], None] | None = None,
-) -> tuple[int, int]:
+    bulk: bool = False,
+    rebuild_vector_index: bool = False,
+) -> list[tuple[int, int]]:
+    """
+    Parse, embed and insert several log files. Chunks from every file without a cached
+    embedding run are embedded together in one pass, so the model sees full batches
+    instead of each file's short tail; vectors are split back per file by offset.
+    Returns (master_id, inserted_rows) per file, in input order.
+
+    ``bulk`` is meant for bootstrap loads: events are COPYed into an UNLOGGED staging
+    table and moved into log_event with one INSERT ... SELECT, all in one transaction.
+    ``rebuild_vector_index`` additionally drops the HNSW index for the move and builds
+    it again afterwards (this locks log_event for the duration).
+    """
 
-    path = Path(file_path)
     parser = LogParser()
-    entries: list[ParsedLogEntry] = list(parser.parse_file(path))
-
-    if not entries:
-        raise ValueError(f"No parsed log entries in {path}")
-
-    embedding_json = _embedding_json_path(path)
-    cached = _load_cached_embeddings(embedding_json)
-
-    if cached:
-        chunks, vectors = cached
-        logging.info("Loaded %s cached embeddings", len(vectors))
-    else:
-        messages = _parsed_messages(entries)
-        chunks, vectors = embed_with_recursive_splitter(
-            messages,
+    files: list[_FileEmbeddings] = []
+    pending: list[tuple[_FileEmbeddings, int, int]] = []
+    pending_chunks: list[str] = []
+
+    for file_path in file_paths:
+        path = Path(file_path)
+        entries, parse_metadata = parser.parse_file_with_metadata(path)
+        if not entries:
+            raise ValueError(f"No parsed log entries in {path}")
+
+        cached = _load_cached_embeddings(_embedding_json_path(path))
+        if cached:
+            chunks, vectors = cached
+            logging.info("Loaded %s cached embeddings for %s", len(vectors), path.name)
+            files.append(_FileEmbeddings(path, parse_metadata, chunks, vectors))
+            continue
+
+        chunks = _split_messages(
+            _parsed_messages(entries),
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
-            model_name=model_name,
-            embed_batch_size=embed_batch_size,
-            progress_callback=progress_callback,
         )
-
         if not chunks:
-            raise ValueError("No chunks produced")
-
-        _store_embeddings_json(
-            embedding_json,
-            source_path=path,
-            model_name=model_name,
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            chunks=chunks,
-            vectors=vectors,
+            raise ValueError(f"No chunks produced for {path}")
+
+        item = _FileEmbeddings(path, parse_metadata, chunks)
+        files.append(item)
+        pending.append((item, len(pending_chunks), len(pending_chunks) + len(chunks)))
+        pending_chunks.extend(chunks)
+
+    if pending_chunks:
+        all_vectors = np.asarray(
+            _embed_chunks(
+                pending_chunks,
+                model_name=model_name,
+                embed_batch_size=embed_batch_size,
+                progress_callback=progress_callback,
+            ),
+            dtype=np.float32,
         )
+        for item, start, end in pending:
+            item.vectors = all_vectors[start:end]
+            _store_embeddings_json(
+                _embedding_json_path(item.path),
+                source_path=item.path,
+                model_name=model_name,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                chunks=item.chunks,
+                vectors=item.vectors,
+            )
 
     config = PgVectorConnectionConfig.from_env(dotenv_path)
-    manager = PgVectorConnectionManager(config)
-
-    with manager.connection() as conn:
-        master_id = insert_log_master(
-            conn,
-            source_name=path.name,
-            line_count=len(entries),
-            byte_size=path.stat().st_size,
-            parse_status="SUCCESS",
-            parse_error=None,
-            environment=environment,
-            source_type=source_type,
-            log_format=log_format,
-        )
 
-        inserted = insert_log_events(conn, master_id, chunks, vectors)
+    results: list[tuple[int, int]] = []
+    with PgVectorConnectionManager(config, max_size=1) as manager, manager.connection() as conn:
+        if bulk:
+            with conn.cursor() as cur:
+                cur.execute(CREATE_LOG_EVENT_STAGE)
+                cur.execute(TRUNCATE_LOG_EVENT_STAGE)
+
+        for item in files:
+            master_id = insert_log_master(
+                conn,
+                source_name=item.path.name,
+                line_count=item.parse_metadata["line_count"],
+                byte_size=item.parse_metadata["byte_size"],
+                parse_status="SUCCESS",
+                parse_error=None,
+                environment=environment,
+                source_type=source_type,
+                log_format=log_format,
+                commit=False,
+            )
+            if bulk:
+                inserted = insert_log_events(
+                    conn,
+                    master_id,
+                    item.chunks,
+                    item.vectors,
+                    table=LOG_EVENT_STAGE_TABLE,
+                    commit=False,
+                )
+            else:
+                # Each file's master row and events commit together.
+                inserted = insert_log_events(conn, master_id, item.chunks, item.vectors)
+            results.append((master_id, inserted))
+
+        if bulk:
+            with conn.cursor() as cur:
+                if rebuild_vector_index:
+                    cur.execute(DROP_LOG_EVENT_EMBEDDING_INDEX)
+                cur.execute(FLUSH_LOG_EVENT_STAGE)
+                cur.execute(TRUNCATE_LOG_EVENT_STAGE)
+                if rebuild_vector_index:
+                    cur.execute(
+                        "SELECT set_config('max_parallel_maintenance_workers', %s, true)",
+                        (str(INDEX_BUILD_WORKERS),),
+                    )
+                    cur.execute(CREATE_LOG_EVENT_EMBEDDING_INDEX)
+
+    return results
+
 
-    return master_id, inserted
+def insert_embeddings_for_log_file(
+    file_path: str | Path,
+    *,
+    dotenv_path: str | None = ".env",
+    environment: str = "dev",
+    source_type: str = "file",
+    log_format: str = "auto",
+    chunk_size: int = 1200,
+    chunk_overlap: int = 100,
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    embed_batch_size: int = 128,
+    progress_callback: Callable[[int, int, str | None], None] | None = None,
+) -> tuple[int, int]:
+
+    return insert_embeddings_for_log_files(
+        [file_path],
+        dotenv_path=dotenv_path,
+        environment=environment,
+        source_type=source_type,
+        log_format=log_format,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        model_name=model_name,
+        embed_batch_size=embed_batch_size,
+        progress_callback=progress_callback,
+    )[0]
 
 
 # ============================================================
@@ -6,24 +6,42 @@ log_master + log_event records. Uses a simple worker to embed log messages with
 lightweight progress logging.
 """
 
+import importlib.util
 import logging
+import multiprocessing as mp
+import os
+import platform
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
 from datetime import datetime, timezone
 from pathlib import Path
 from queue import Queue
 from threading import Thread
-from typing import List, Sequence
+from typing import Any, Dict, Iterator, List, Sequence
 
-from psycopg.types.json import Json
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
 
 from src.vectorstore.client.connection import (
     PgVectorConnectionConfig,
     PgVectorConnectionManager,
 )
-from src.vectorstore.client.log_manager import insert_log_master
-from src.vectorstore.db_queries.queries import INSERT_LOG_EVENT
+from src.vectorstore.client.log_manager import insert_log_master, update_log_master_status
+from src.vectorstore.db_queries.queries import (
+    COPY_LOG_EVENT_EMBEDDED_BINARY,
+    LOG_EVENT_EMBEDDED_COPY_TYPES,
+)
 from src.vectorstore.parser.log_parser import LogParser, ParsedLogEntry
 
+try:
+    # Optional static (lookup + mean) embeddings for throughput-first ingestion.
+    from model2vec import StaticModel
+except ImportError:  # pragma: no cover - model2vec not installed
+    StaticModel = None  # type: ignore[assignment]
+
 try:
     # LangChain 0.1+ moved community integrations here.
     from langchain_community.embeddings import HuggingFaceEmbeddings
@@ -36,6 +54,10 @@ class EmbeddingJob:
     path: Path
     lines: Sequence[str] | None = None
     max_lines: int | None = None
+    # Position of this shard's first line within the file, for reassembly.
+    offset: int = 0
+    # Parsed entries behind ``lines``, handed through to the result for the DB writer.
+    entries: Sequence[ParsedLogEntry] | None = None
 
 
 @dataclass(frozen=True)
@@ -44,29 +66,277 @@ class EmbeddingResult:
     line_count: int
     vector_count: int
     vector_dim: int
-    embeddings: Sequence[Sequence[float]]
+    # (vector_count, vector_dim) float32, rows in input order.
+    embeddings: np.ndarray
     first_vector: List[float]
+    offset: int = 0
+    entries: Sequence[ParsedLogEntry] | None = None
+
+
+# Lines handed to embed_documents() per call (one progress log each).
+EMBED_BATCH_SIZE = int(os.environ.get("EMBED_BATCH_SIZE", "500"))
+# Forward-pass batch inside SentenceTransformer.encode(); with length-sorted input each
+# batch pads only to similar lengths.
+EMBED_ENCODE_BATCH_SIZE = int(os.environ.get("EMBED_ENCODE_BATCH_SIZE", "64"))
+# Worker threads in main(); 0 sizes the pool from the hardware (see _worker_devices).
+EMBED_WORKERS = int(os.environ.get("EMBED_WORKERS", "0"))
+# Intra-op (BLAS/OpenMP) threads per CPU worker. 1 with many workers suits batch ingest
+# (throughput, no oversubscription); 0 keeps torch's default of every core for a single
+# worker (lowest per-batch latency).
+EMBED_THREADS_PER_WORKER = int(os.environ.get("EMBED_THREADS_PER_WORKER", "1"))
+# torch starts with one intra-op thread per physical core; read before any override.
+PHYSICAL_CORES = torch.get_num_threads()
+# Batches allowed in flight between pipeline stages in main().
+PIPELINE_QUEUE_BATCHES = 4
+# > 0 runs the models in that many spawned processes (see ProcessPoolEmbeddings).
+EMBED_PROCESSES = int(os.environ.get("EMBED_PROCESSES", "0"))
+
+DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+# torch (default), onnx, openvino or auto (fp16 torch on CUDA, else openvino on x86_64 and
+# onnx elsewhere). The int8 backends need sentence-transformers >= 3.2 and fall back to torch.
+EMBED_BACKEND = os.environ.get("EMBED_BACKEND", "torch")
+# int8 weights that use AVX-512 VNNI dot products on x86 CPUs.
+ONNX_QINT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+OPENVINO_QINT8_FILE = "openvino/openvino_model_qint8_quantized.xml"
+_QINT8_FILES = {"onnx": ONNX_QINT8_FILE, "openvino": OPENVINO_QINT8_FILE}
+# log_event.embedding is halfvec(384).
+EMBEDDING_DIMS = 384
+# EMBED_BACKEND=model2vec: a distilled static model, plus an optional (model_dim, 384)
+# float32 .npy that projects its vectors to the column's width. Static vectors live in a
+# different space than MiniLM's, so queries must be embedded with the same backend.
+MODEL2VEC_MODEL = os.environ.get("MODEL2VEC_MODEL", "minishlab/potion-base-8M")
+MODEL2VEC_PROJECTION = os.environ.get("MODEL2VEC_PROJECTION")
+
+
+class SentenceTransformerEmbeddings:
+    """
+    embed_documents() adapter over a SentenceTransformer, so EmbeddingWorker can take
+    either this or a LangChain HuggingFaceEmbeddings.
+    """
+
+    def __init__(self, model: SentenceTransformer) -> None:
+        self.model = model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_array(texts).tolist()
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        # Same vectors as embed_documents() without the round trip through Python floats.
+        return self.model.encode(
+            texts,
+            batch_size=EMBED_ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+
+
+class Model2VecEmbeddings:
+    """
+    embed_documents()/embed_array() adapter over a model2vec StaticModel: a token lookup
+    plus mean instead of a transformer forward pass.
+    """
+
+    def __init__(self, model: Any, projection: np.ndarray | None = None) -> None:
+        self.model = model
+        self.projection = projection
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_array(texts).tolist()
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        vectors = np.asarray(self.model.encode(texts), dtype=np.float32)
+        if self.projection is not None:
+            vectors = vectors @ self.projection
+        # Unit length for the inner-product index, as with the other backends.
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.maximum(norms, 1e-12, out=norms)
+        return vectors / norms
+
+
+def _build_model2vec() -> Model2VecEmbeddings | None:
+    if StaticModel is None:
+        logging.warning("model2vec is not installed; using torch")
+        return None
+    model = StaticModel.from_pretrained(MODEL2VEC_MODEL)
+    projection = None
+    if MODEL2VEC_PROJECTION:
+        projection = np.load(MODEL2VEC_PROJECTION).astype(np.float32, copy=False)
+    embedder = Model2VecEmbeddings(model, projection)
+    dims = embedder.embed_array(["warmup"]).shape[1]
+    if dims != EMBEDDING_DIMS:
+        raise ValueError(
+            f"{MODEL2VEC_MODEL} gives {dims}-dim vectors; set MODEL2VEC_PROJECTION to a "
+            f"(model_dim, {EMBEDDING_DIMS}) .npy to match log_event.embedding"
+        )
+    logging.info("Using model2vec static embedder (%s)", MODEL2VEC_MODEL)
+    return embedder
+
 
+# Packages the sentence-transformers [onnx] / [openvino] extras install per backend.
+_BACKEND_PACKAGES = {
+    "onnx": ("optimum", "onnxruntime"),
+    "openvino": ("optimum", "openvino"),
+}
 
-EMBED_BATCH_SIZE = 500
+
+def _backend_installed(backend: str) -> bool:
+    return all(importlib.util.find_spec(name) is not None for name in _BACKEND_PACKAGES[backend])
+
+
+def build_embedder(
+    model_name: str = DEFAULT_MODEL_NAME,
+    *,
+    backend: str | None = None,
+    device: str | None = None,
+) -> HuggingFaceEmbeddings | SentenceTransformerEmbeddings | Model2VecEmbeddings:
+    """
+    Build the embedder selected by ``backend`` (default: the EMBED_BACKEND env var).
+    ``device`` pins the torch path to a specific GPU, e.g. "cuda:1".
+    """
+
+    backend = (backend or EMBED_BACKEND).lower()
+    cuda = torch.cuda.is_available()
+    if backend == "auto":
+        # OpenVINO targets Intel x86 (VNNI/AMX); ONNX Runtime covers ARM and the rest.
+        # Only backends whose extra is installed are considered; otherwise torch.
+        candidates = [] if cuda else ["onnx"]
+        if not cuda and platform.machine().lower() in ("x86_64", "amd64"):
+            candidates.insert(0, "openvino")
+        backend = next((name for name in candidates if _backend_installed(name)), "torch")
+        logging.info("EMBED_BACKEND=auto selected %s", backend)
+    if backend in _QINT8_FILES and not _backend_installed(backend):
+        logging.warning(
+            "%s backend needs the sentence-transformers[%s] extra; using torch", backend, backend
+        )
+    elif backend in _QINT8_FILES:
+        file_name = _QINT8_FILES[backend]
+        try:
+            model = SentenceTransformer(
+                model_name,
+                backend=backend,
+                model_kwargs={"file_name": file_name},
+            )
+            logging.info("Using %s int8 embedder (%s)", backend, file_name)
+            return SentenceTransformerEmbeddings(model)
+        except Exception as exc:
+            # ImportError from a partial extra install, or the loader's own Exception when
+            # the backend or its int8 export can't be loaded; torch still works.
+            logging.warning("%s backend failed to load (%s); using torch", backend, exc)
+    elif backend == "model2vec":
+        static = _build_model2vec()
+        if static is not None:
+            return static
+    elif backend != "torch":
+        logging.warning("Unknown EMBED_BACKEND %r; using torch", backend)
+
+    # Unit-length vectors, as the inner-product HNSW index on log_event.embedding expects.
+    encode_kwargs = {"normalize_embeddings": True}
+    if not cuda:
+        return HuggingFaceEmbeddings(model_name=model_name, encode_kwargs=encode_kwargs)
+
+    embedder = HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": device or "cuda"},
+        encode_kwargs=encode_kwargs,
+    )
+    # FP16 runs the GEMMs on tensor cores; normalized embeddings are unaffected in practice.
+    embedder.client.half()
+    logging.info("Using torch fp16 embedder on CUDA")
+    return embedder
+
+
+_PROCESS_EMBEDDER: HuggingFaceEmbeddings | SentenceTransformerEmbeddings | None = None
+
+
+def _init_embedder(model_name: str, backend: str | None, num_threads: int) -> None:
+    # Runs once in each pool process; the model lives in a process global.
+    global _PROCESS_EMBEDDER
+    torch.set_num_threads(num_threads)
+    _PROCESS_EMBEDDER = build_embedder(model_name, backend=backend)
+
+
+def _embed_in_process(texts: List[str]) -> np.ndarray:
+    embed_array = getattr(_PROCESS_EMBEDDER, "embed_array", None)
+    if embed_array is not None:
+        return np.asarray(embed_array(texts), dtype=np.float32)
+    return np.asarray(_PROCESS_EMBEDDER.embed_documents(texts), dtype=np.float32)
+
+
+class ProcessPoolEmbeddings:
+    """
+    embed_documents()/embed_array() over a pool of spawned processes, each with its own
+    model, so CPU inference and the Python glue around it run outside the parent's GIL.
+    Several EmbeddingWorker threads can share one instance; each call runs in a free
+    process. Uses spawn since torch is not fork-safe. Call close() when done.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        *,
+        backend: str | None = None,
+        processes: int = 2,
+    ) -> None:
+        self.processes = processes
+        # Split the cores between processes instead of each grabbing all of them. Spawned
+        # children inherit OMP_NUM_THREADS before torch loads, so OpenMP sizes to match.
+        num_threads = EMBED_THREADS_PER_WORKER or max(1, PHYSICAL_CORES // processes)
+        os.environ.setdefault("OMP_NUM_THREADS", str(num_threads))
+        self.executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_embedder,
+            initargs=(model_name, backend, num_threads),
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_array(texts).tolist()
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        return self.executor.submit(_embed_in_process, list(texts)).result()
+
+    def close(self) -> None:
+        self.executor.shutdown()
 
 
 class EmbeddingWorker(Thread):
     """
     Thread worker that reads log files and produces embeddings.
     Uses a task queue of EmbeddingJob and writes EmbeddingResult to a result queue.
+    A failing job is recorded in `errors` (shared with the caller when passed) and later
+    jobs are skipped; task_done() is always called so queue joins never hang.
     """
 
     def __init__(
         self,
-        embedder: HuggingFaceEmbeddings,
+        embedder: HuggingFaceEmbeddings | SentenceTransformerEmbeddings | ProcessPoolEmbeddings | None,
         tasks: "Queue[EmbeddingJob | None]",
         results: "Queue[EmbeddingResult]",
+        *,
+        backend: str | None = None,
+        device: str | None = None,
+        num_threads: int | None = None,
+        errors: List[BaseException] | None = None,
     ) -> None:
         super().__init__(daemon=True)
+        self.errors: List[BaseException] = [] if errors is None else errors
+        if num_threads:
+            # torch's intra-op pool is process-wide, so this applies to every worker thread.
+            torch.set_num_threads(num_threads)
+        # embedder=None builds one from backend / EMBED_BACKEND, so each worker owns its model.
+        if embedder is None:
+            embedder = build_embedder(backend=backend, device=device)
         self.embedder = embedder
         self.tasks = tasks
         self.results = results
+        # Pay lazy init / graph compilation here rather than on the first real batch.
+        self.embedder.embed_documents(["warmup"])
+
+    def _embed(self, batch: List[str]) -> np.ndarray:
+        embed_array = getattr(self.embedder, "embed_array", None)
+        if embed_array is not None:
+            return np.asarray(embed_array(batch), dtype=np.float32)
+        return np.asarray(self.embedder.embed_documents(batch), dtype=np.float32)
 
     def run(self) -> None:
         while True:
@@ -75,55 +345,112 @@ class EmbeddingWorker(Thread):
                 self.tasks.task_done()
                 break
 
-            if job.lines is not None:
-                lines = list(job.lines if job.max_lines is None else job.lines[: job.max_lines])
-            else:
-                lines = _read_lines(job.path, max_lines=job.max_lines)
-
-            vectors: List[Sequence[float]] = []
-            if lines:
-                total = len(lines)
-                for start in range(0, total, EMBED_BATCH_SIZE):
-                    end = min(start + EMBED_BATCH_SIZE, total)
-                    batch = lines[start:end]
-                    batch_vectors = self.embedder.embed_documents(batch)
-                    vectors.extend(batch_vectors)
-                    logging.info(
-                        "Embedded lines %s-%s/%s for %s",
-                        start + 1,
-                        end,
-                        total,
-                        job.path.name,
-                    )
+            try:
+                if not self.errors:  # after a failure, only drain the queue
+                    self.results.put(self._run_job(job))
+            except BaseException as exc:
+                logging.exception("Embedding failed for %s (shard @%s)", job.path.name, job.offset)
+                self.errors.append(exc)
+            finally:
+                self.tasks.task_done()
 
-            vector_dim = len(vectors[0]) if vectors else 0
+    def _run_job(self, job: EmbeddingJob) -> EmbeddingResult:
+        if job.lines is not None:
+            lines = list(job.lines if job.max_lines is None else job.lines[: job.max_lines])
+            line_count = len(lines)
+            vectors = self._embed_lines(job, lines)
+        else:
+            line_count, vectors = self._embed_file(job)
+
+        return EmbeddingResult(
+            path=job.path,
+            line_count=line_count,
+            vector_count=vectors.shape[0],
+            vector_dim=vectors.shape[1],
+            embeddings=vectors,
+            first_vector=vectors[0].tolist() if len(vectors) else [],
+            offset=job.offset,
+            entries=job.entries,
+        )
 
-            self.results.put(
-                EmbeddingResult(
-                    path=job.path,
-                    line_count=len(lines),
-                    vector_count=len(vectors),
-                    vector_dim=vector_dim,
-                    embeddings=vectors,
-                    first_vector=vectors[0] if vectors else [],
-                )
+    def _embed_lines(self, job: EmbeddingJob, lines: List[str]) -> np.ndarray:
+        # One contiguous float32 matrix instead of a list of Python float lists.
+        vectors = np.empty((0, 0), dtype=np.float32)
+        total = len(lines)
+        if not total:
+            return vectors
+        # Embed shortest-first so each batch pads to similar lengths, then scatter
+        # the vectors back to input order.
+        order = np.argsort(np.fromiter(map(len, lines), dtype=np.int64, count=total), kind="stable")
+        for start in range(0, total, EMBED_BATCH_SIZE):
+            end = min(start + EMBED_BATCH_SIZE, total)
+            batch_vectors = self._embed([lines[i] for i in order[start:end]])
+            if start == 0:
+                # The dimension is known once the first batch is back.
+                vectors = np.empty((total, batch_vectors.shape[1]), dtype=np.float32)
+            vectors[order[start:end]] = batch_vectors
+            logging.info(
+                "Embedded lines %s-%s/%s for %s (shard @%s)",
+                start + 1,
+                end,
+                total,
+                job.path.name,
+                job.offset,
             )
-            self.tasks.task_done()
+        return vectors
+
+    def _embed_file(self, job: EmbeddingJob) -> tuple[int, np.ndarray]:
+        # Streams the file batch by batch, so only one batch of text is held at a time;
+        # encode() already length-sorts inside each batch.
+        parts: List[np.ndarray] = []
+        line_count = 0
+        for batch in _iter_batches(job.path, max_lines=job.max_lines, batch_size=EMBED_BATCH_SIZE):
+            parts.append(self._embed(batch))
+            logging.info("Embedded lines %s-%s for %s", line_count + 1, line_count + len(batch), job.path.name)
+            line_count += len(batch)
+        if not parts:
+            return 0, np.empty((0, 0), dtype=np.float32)
+        return line_count, np.concatenate(parts)
+
+
+def _worker_devices() -> List[str | None]:
+    """
+    One entry per embedding worker: a CUDA device per GPU, otherwise physical cores /
+    EMBED_THREADS_PER_WORKER CPU workers (a single worker when that is 0).
+    """
+
+    if torch.cuda.is_available():
+        count = EMBED_WORKERS or torch.cuda.device_count()
+        return [f"cuda:{i % torch.cuda.device_count()}" for i in range(count)]
+    threads = EMBED_THREADS_PER_WORKER or PHYSICAL_CORES
+    count = EMBED_WORKERS or max(1, PHYSICAL_CORES // threads)
+    return [None] * count
 
 
-def _read_lines(path: Path, *, max_lines: int | None = None) -> List[str]:
-    lines: List[str] = []
+def _iter_batches(
+    path: Path,
+    *,
+    max_lines: int | None = None,
+    batch_size: int = EMBED_BATCH_SIZE,
+) -> Iterator[List[str]]:
+    """
+    Yield lists of up to batch_size lines (newlines stripped) from path, reading lazily.
+    """
+
+    batch: List[str] = []
     with path.open("r", encoding="utf-8", errors="ignore") as handle:
-        for i, line in enumerate(handle):
-            if max_lines is not None and i >= max_lines:
-                break
-            lines.append(line.rstrip("\n"))
-    return lines
+        for line in islice(handle, max_lines):
+            batch.append(line.rstrip("\n"))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
 
 
 def sample_embedding() -> List[float]:
     sentences = ["hello world", "langchain embeddings sanity check"]
-    embedder = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+    embedder = build_embedder()
     vectors = embedder.embed_documents(sentences)
     # Return the first embedding to inspect its dimensionality.
     return vectors[0]
@@ -149,71 +476,107 @@ def _parse_ts(value: object) -> datetime | None:
             return None
 
     if isinstance(value, str):
-        candidate = value.strip()
-        candidate_iso = candidate.replace("Z", "+00:00").replace(",", ".")
-        for fmt in (
-            "%Y-%m-%d %H:%M:%S.%f%z",
-            "%Y-%m-%d %H:%M:%S.%f",
-            "%Y-%m-%d %H:%M:%S,%f",
-            "%Y-%m-%d %H:%M:%S",
-        ):
-            try:
-                parsed = datetime.strptime(candidate_iso, fmt)
-                return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
-            except ValueError:
-                continue
+        return _parse_ts_str(value.strip())
+
+    return None
+
+
+@lru_cache(maxsize=65536)
+def _parse_ts_str(candidate: str) -> datetime | None:
+    # Log timestamps repeat heavily (same second, many lines), so results are cached.
+    candidate_iso = candidate.replace("Z", "+00:00").replace(",", ".")
+    try:
+        # Handles offsets and fractions natively on 3.11+, far faster than strptime.
+        parsed = datetime.fromisoformat(candidate_iso)
+    except ValueError:
+        # Pre-3.11 fromisoformat rejects e.g. 1-2 digit fractions; pick the one strptime
+        # format that fits from the shape instead of trying each in turn.
+        if len(candidate_iso) < 19 or candidate_iso[10] != " ":
+            return None
+        if len(candidate_iso) == 19:
+            fmt = "%Y-%m-%d %H:%M:%S"
+        elif "+" in candidate_iso[19:] or "-" in candidate_iso[19:]:
+            fmt = "%Y-%m-%d %H:%M:%S.%f%z"
+        else:
+            fmt = "%Y-%m-%d %H:%M:%S.%f"
         try:
-            parsed = datetime.fromisoformat(candidate_iso)
-            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+            parsed = datetime.strptime(candidate_iso, fmt)
         except ValueError:
             return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
 
-    return None
+
+# Parsed-field keys copied as-is into log_event, in the order insert_log_events unpacks them.
+_EVENT_DIRECT_KEYS = (
+    "level", "trace_id", "span_id", "logger", "thread",
+    "exception_type", "exception_msg", "stack_trace",
+)
 
 
-def insert_log_events(conn, master_id: int, entries: Sequence[ParsedLogEntry], embeddings: Sequence[Sequence[float]]) -> int:
+def insert_log_events(
+    conn,
+    master_id: int,
+    entries: Sequence[ParsedLogEntry],
+    embeddings: Sequence[Sequence[float]] | np.ndarray,
+) -> int:
     """
-    Insert log_event rows for parsed entries. Embeddings are stored inside metadata.
+    Stream log_event rows for parsed entries with one binary COPY. Embeddings go into the
+    halfvec(384) column in binary rather than through JSON metadata.
     """
 
-    now = datetime.now(timezone.utc)
-    rows = []
-    for entry, vector in zip(entries, embeddings):
-        fields = dict(entry.fields or {})
-        fields["embedding"] = vector
-        ts_value = fields.get("timestamp") or fields.get("ts")
-        rows.append(
-            {
-                "master_id": master_id,
-                "ts": _parse_ts(ts_value),
-                "service_name": fields.get("service_name") or fields.get("service"),
-                "level": fields.get("level"),
-                "trace_id": fields.get("trace_id"),
-                "span_id": fields.get("span_id"),
-                "message": fields.get("message") or fields.get("msg") or entry.raw,
-                "raw_line": entry.raw,
-                "metadata": Json(fields),
-                "logger_name": fields.get("logger"),
-                "thread_name": fields.get("thread"),
-                "exception_type": fields.get("exception_type"),
-                "exception_msg": fields.get("exception_msg"),
-                "stack_trace": fields.get("stack_trace"),
-                "created_at": now,
-            }
-        )
-
-    if not rows:
+    if not entries:
         return 0
 
+    # pgvector's halfvec binary dumper narrows each float32 row to fp16; a float32 ndarray
+    # from EmbeddingWorker passes through here without a copy.
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    # Hot loop: bound methods and the module-level helper are hoisted into locals, and the
+    # single-key columns come from one C-level map() over _EVENT_DIRECT_KEYS.
+    parse_ts = _parse_ts
+    direct_keys = _EVENT_DIRECT_KEYS
     with conn.cursor() as cur:
-        cur.executemany(INSERT_LOG_EVENT, rows)
-    return len(rows)
+        with cur.copy(COPY_LOG_EVENT_EMBEDDED_BINARY) as copy:
+            copy.set_types(LOG_EVENT_EMBEDDED_COPY_TYPES)
+            write_row = copy.write_row
+            for entry, vector in zip(entries, matrix):
+                fields = entry.fields or {}
+                get = fields.get
+                level, trace_id, span_id, logger_name, thread_name, exc_type, exc_msg, stack = map(
+                    get, direct_keys
+                )
+                raw = entry.raw
+                write_row(
+                    (
+                        master_id,
+                        parse_ts(get("timestamp") or get("ts")),
+                        get("service_name") or get("service"),
+                        level,
+                        trace_id,
+                        span_id,
+                        get("message") or get("msg") or raw,
+                        raw,
+                        fields,
+                        logger_name,
+                        thread_name,
+                        exc_type,
+                        exc_msg,
+                        stack,
+                        vector,
+                    )
+                )
+    return min(len(entries), len(matrix))
+
+
+def _entry_message(entry: ParsedLogEntry) -> str:
+    fields = entry.fields or {}
+    return fields.get("message") or fields.get("msg") or entry.raw
 
 
 def main() -> None:
     """
-    Parse a log file with LogParser, embed parsed messages via a worker, and insert into DB.
-    Adjust SAMPLE_LOG_PATH if needed.
+    Parse a log file with LogParser, embed parsed messages via a worker pool, and insert into DB.
+    Reader, embedders and DB writer run as overlapping stages joined by bounded queues, so
+    memory stays flat however large the file is. Adjust SAMPLE_LOG_PATH if needed.
     """
 
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
@@ -223,49 +586,121 @@ def main() -> None:
     if not sample_log.exists():
         raise FileNotFoundError(f"Sample log not found: {sample_log}")
 
-    # Parse the log file and extract messages (fallback to raw when missing)
-    parser = LogParser()
-    parsed_entries: List[ParsedLogEntry] = list(parser.parse_file(sample_log))
-    parsed_messages: List[str] = []
-    for entry in parsed_entries:
-        fields = entry.fields or {}
-        parsed_messages.append(fields.get("message") or fields.get("msg") or entry.raw)
-
-    tasks: Queue[EmbeddingJob | None] = Queue()
-    results: Queue[EmbeddingResult] = Queue()
-    embedder = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-
-    worker = EmbeddingWorker(embedder, tasks, results)
-    worker.start()
-
-    tasks.put(EmbeddingJob(path=sample_log, lines=parsed_messages))
-    tasks.put(None)  # sentinel to stop the worker after this job
-    tasks.join()
-
-    result = results.get()
-    print("Embedded file:", result.path.name)
-    print("Lines read:", result.line_count)
-    print("Vectors:", result.vector_count)
-    print("Vector dimension:", result.vector_dim)
-    print("First vector values:", result.first_vector)
-
-    # Insert into DB: log_master + log_event
+    # log_event rows reference log_master, so the master row goes in first and gets its
+    # line count and final status once the stream is done.
     config = PgVectorConnectionConfig.from_env(".env")
-    manager = PgVectorConnectionManager(config)
+    # The writer holds one connection for the whole stream; master row updates use another.
+    manager = PgVectorConnectionManager(config, max_size=2)
     with manager.connection() as conn:
         master_id = insert_log_master(
             conn,
             source_name=sample_log.name,
-            line_count=len(parsed_entries),
+            line_count=0,
             byte_size=sample_log.stat().st_size,
-            parse_status="SUCCESS",
+            parse_status="IN_PROGRESS",
             parse_error=None,
             environment="dev",
             source_type="file",
             log_format="auto",
         )
-        inserted_events = insert_log_events(conn, master_id, parsed_entries, result.embeddings)
-        print(f"Inserted log_master id={master_id} with {inserted_events} log_event rows")
+
+    parser = LogParser()
+    parse_q: Queue[EmbeddingJob | None] = Queue(maxsize=PIPELINE_QUEUE_BATCHES)
+    insert_q: Queue[EmbeddingResult | None] = Queue(maxsize=PIPELINE_QUEUE_BATCHES)
+    process_embedder: ProcessPoolEmbeddings | None = None
+    # Reader, workers and writer all record failures here; main re-raises the first.
+    errors: List[BaseException] = []
+    if EMBED_PROCESSES > 0:
+        # Threads only feed batches to the process pool; one per process keeps it busy.
+        process_embedder = ProcessPoolEmbeddings(processes=EMBED_PROCESSES)
+        workers = [
+            EmbeddingWorker(process_embedder, parse_q, insert_q, errors=errors) for _ in range(EMBED_PROCESSES)
+        ]
+    else:
+        workers = [
+            EmbeddingWorker(
+                None, parse_q, insert_q, device=device, num_threads=EMBED_THREADS_PER_WORKER, errors=errors
+            )
+            for device in _worker_devices()
+        ]
+    parse_stats: Dict[str, Any] = {}
+    inserted = [0]
+
+    def read() -> None:
+        batch: List[ParsedLogEntry] = []
+        offset = 0
+        try:
+            for entry in parser.parse_file(sample_log, stats=parse_stats):
+                batch.append(entry)
+                if len(batch) == EMBED_BATCH_SIZE:
+                    parse_q.put(
+                        EmbeddingJob(sample_log, [_entry_message(e) for e in batch], offset=offset, entries=batch)
+                    )
+                    offset += len(batch)
+                    batch = []
+                    if errors:
+                        break  # a worker or the writer failed; stop feeding the pipeline
+            if batch and not errors:
+                parse_q.put(
+                    EmbeddingJob(sample_log, [_entry_message(e) for e in batch], offset=offset, entries=batch)
+                )
+        except BaseException as exc:
+            errors.append(exc)
+        finally:
+            for _ in workers:
+                parse_q.put(None)  # one sentinel per worker
+
+    def write() -> None:
+        drained = False
+        try:
+            with manager.connection() as conn:
+                while (result := insert_q.get()) is not None:
+                    if errors:
+                        continue  # keep draining so the embedders never block on a full queue
+                    try:
+                        inserted[0] += insert_log_events(conn, master_id, result.entries, result.embeddings)
+                    except BaseException as exc:
+                        errors.append(exc)
+                drained = True
+                if errors:
+                    conn.rollback()
+        except BaseException as exc:
+            # No connection (pool timeout, connect failure) or a failed commit: record it,
+            # and consume insert_q to the sentinel so workers and parse_q.join() don't hang.
+            errors.append(exc)
+            while not drained:
+                drained = insert_q.get() is None
+
+    reader = Thread(target=read, name="log-reader", daemon=True)
+    writer = Thread(target=write, name="log-writer", daemon=True)
+    writer.start()
+    for worker in workers:
+        worker.start()
+    reader.start()
+
+    reader.join()
+    parse_q.join()
+    insert_q.put(None)
+    writer.join()
+    if process_embedder is not None:
+        process_embedder.close()
+
+    with manager.connection() as conn:
+        update_log_master_status(
+            conn,
+            master_id,
+            line_count=parse_stats.get("line_count", 0),
+            parse_status="FAILED" if errors else "SUCCESS",
+            parse_error=str(errors[0]) if errors else None,
+        )
+    manager.close()
+    if errors:
+        raise errors[0]
+
+    print("Embedded file:", sample_log.name)
+    print("Workers:", len(workers))
+    print("Lines read:", parse_stats.get("line_count", 0))
+    print(f"Inserted log_master id={master_id} with {inserted[0]} log_event rows")
 
 
 if __name__ == "__main__":
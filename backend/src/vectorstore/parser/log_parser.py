@@ -3,13 +3,26 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import os
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Iterator, List, Optional, Pattern
 
+import orjson
+
+try:
+    # Optional DFA engine: linear-time matching with no backtracking. Used for the
+    # combined line regex only; anything re2 cannot compile stays on `re`.
+    import re2
+except ImportError:  # pragma: no cover - google-re2 not installed
+    re2 = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+READ_BLOCK_CHARS = 1 << 20
+
 
 @dataclass(frozen=True)
 class ParsedLogEntry:
@@ -44,6 +57,19 @@ class _CompiledPattern:
     continue_regex: Optional[Pattern[str]]
 
 
+@dataclass(frozen=True)
+class _MatchStep:
+    """
+    One stage of line matching: either a JSON pattern, or a run of consecutive regex
+    patterns compiled into a single alternation. ``members`` maps the alternation's
+    wrapper group index (match.lastindex) to its pattern.
+    """
+
+    json_pattern: Optional[_CompiledPattern]
+    regex: Optional[Pattern[str]]
+    members: Dict[int, _CompiledPattern]
+
+
 class LogParser:
     """
     Parse log files located in the data directory using regex/JSON patterns declared
@@ -64,6 +90,7 @@ class LogParser:
         default_data_dir = backend_root / "data" / "raw" / "synthetic"
         self.data_dir = Path(data_dir) if data_dir else default_data_dir
         self._patterns: List[_CompiledPattern] = self._load_patterns(self.patterns_path)
+        self._plans: Dict[Optional[str], List[_MatchStep]] = {}
 
     def parse_directory(self, data_dir: Optional[Path | str] = None) -> Iterator[ParsedLogEntry]:
         """
@@ -84,31 +111,67 @@ class LogParser:
         self,
         file_path: Path | str,
         pattern_hint: Optional[str] = None,
+        *,
+        stats: Optional[Dict[str, Any]] = None,
     ) -> Iterator[ParsedLogEntry]:
         """
         Stream-parse a single log file, yielding ParsedLogEntry objects.
-        A pattern hint can be supplied to try that pattern before others.
+        A pattern hint can be supplied to try that pattern before others. A ``stats``
+        dict receives byte_size up front and line_count once the file is exhausted.
         """
 
         path = Path(file_path)
         if not path.exists():
             raise FileNotFoundError(f"Log file not found: {path}")
 
-        patterns = self._ordered_patterns(pattern_hint)
-        buffered_line: Optional[str] = None
-        line_number = 0
+        yield from self._iter_file(path, self._match_plan(pattern_hint), {} if stats is None else stats)
+
+    def parse_file_with_metadata(
+        self,
+        file_path: Path | str,
+        pattern_hint: Optional[str] = None,
+    ) -> tuple[List[ParsedLogEntry], Dict[str, Any]]:
+        """
+        Parse a single log file and return its entries together with the log_master
+        summary (source_name, line_count, byte_size) gathered during the same pass.
+        """
 
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"Log file not found: {path}")
+
+        stats: Dict[str, Any] = {}
+        entries = list(self._iter_file(path, self._match_plan(pattern_hint), stats))
+        metadata = {
+            "source_name": path.name,
+            "line_count": stats["line_count"],
+            "byte_size": stats["byte_size"],
+            "parse_status": "SUCCESS",
+        }
+        return entries, metadata
+
+    def _iter_file(
+        self,
+        path: Path,
+        plan: List[_MatchStep],
+        stats: Dict[str, Any],
+    ) -> Iterator[ParsedLogEntry]:
         with path.open("r", encoding="utf-8", errors="ignore") as handle:
+            stats["byte_size"] = os.fstat(handle.fileno()).st_size
+            # Numbering comes from enumerate (C-level) over one shared iterator, so lines
+            # pulled in by _consume_continuations keep their numbers too.
+            numbered = enumerate(_iter_lines(handle, stats), start=1)
+            pending: Optional[tuple[int, str]] = None
             while True:
-                raw_line = buffered_line if buffered_line is not None else handle.readline()
-                buffered_line = None
-                if raw_line == "":
-                    break
-
-                line_number += 1
-                line = raw_line.rstrip("\n")
-                entry_line_number = line_number
-                matched = self._match_line(line, patterns)
+                if pending is not None:
+                    item, pending = pending, None
+                else:
+                    item = next(numbered, None)
+                    if item is None:
+                        break
+
+                line_number, line = item
+                matched = self._match_line(line, plan)
                 if not matched:
                     logger.debug("No pattern matched line %s in %s", line_number, path)
                     continue
@@ -120,40 +183,21 @@ class LogParser:
                     if pattern.start_regex:
                         should_expand = bool(pattern.start_regex.search(line))
                     if should_expand:
-                        raw_block, fields, consumed, buffered_line = self._consume_continuations(
-                            handle, pattern, raw_block, fields
+                        raw_block, fields, pending = self._consume_continuations(
+                            numbered, pattern, raw_block, fields
                         )
-                        line_number += consumed
 
                 yield ParsedLogEntry(
                     pattern=pattern.name,
                     source=path,
-                    line_number=entry_line_number,
+                    line_number=line_number,
                     fields=fields,
                     raw=raw_block,
                 )
 
     def _load_patterns(self, patterns_path: Path) -> List[_CompiledPattern]:
-        with patterns_path.open("r", encoding="utf-8") as handle:
-            pattern_data = json.load(handle)
-
-        compiled: List[_CompiledPattern] = []
-        for name, config in pattern_data.items():
-            compiled.append(
-                _CompiledPattern(
-                    name=name,
-                    description=config.get("description", ""),
-                    is_json=bool(config.get("json", False)),
-                    line_regex=self._maybe_compile(config.get("line_pattern")),
-                    group_map={k: int(v) for k, v in (config.get("groups") or {}).items()},
-                    start_regex=self._maybe_compile((config.get("multiline") or {}).get("start_pattern")),
-                    continue_regex=self._maybe_compile((config.get("multiline") or {}).get("continue_pattern")),
-                )
-            )
-        return compiled
-
-    def _maybe_compile(self, pattern: Optional[str]) -> Optional[Pattern[str]]:
-        return re.compile(pattern) if pattern else None
+        # Keyed on mtime so an edited patterns file is picked up by new parsers.
+        return list(_compile_patterns(patterns_path, patterns_path.stat().st_mtime))
 
     def _ordered_patterns(self, hint: Optional[str]) -> List[_CompiledPattern]:
         if not hint:
@@ -162,74 +206,136 @@ class LogParser:
         remainder = [p for p in self._patterns if p.name != hint]
         return preferred + remainder
 
+    def _match_plan(self, hint: Optional[str]) -> List[_MatchStep]:
+        plan = self._plans.get(hint)
+        if plan is None:
+            plan = self._plans[hint] = self._build_plan(self._ordered_patterns(hint))
+        return plan
+
+    def _build_plan(self, patterns: List[_CompiledPattern]) -> List[_MatchStep]:
+        """
+        Fold each run of consecutive regex patterns into one alternation, so the regex
+        engine picks the first matching pattern in a single match() call. Alternatives
+        are tried left to right, which keeps the sequential first-match-wins order.
+        """
+
+        plan: List[_MatchStep] = []
+        run: List[_CompiledPattern] = []
+
+        def flush() -> None:
+            if run:
+                plan.extend(self._combine(run))
+                run.clear()
+
+        for pattern in patterns:
+            if pattern.is_json:
+                flush()
+                plan.append(_MatchStep(json_pattern=pattern, regex=None, members={}))
+            elif pattern.line_regex is not None:
+                run.append(pattern)
+        flush()
+        return plan
+
+    def _combine(self, patterns: List[_CompiledPattern]) -> List[_MatchStep]:
+        parts: List[str] = []
+        members: Dict[int, _CompiledPattern] = {}
+        offset = 1
+        for pattern in patterns:
+            members[offset] = pattern
+            parts.append(f"({pattern.line_regex.pattern})")
+            offset += pattern.line_regex.groups + 1
+        combined_source = "|".join(parts)
+        if re2 is not None:
+            try:
+                # RE2 alternation is leftmost-first like `re`, so pattern priority holds.
+                return [_MatchStep(json_pattern=None, regex=re2.compile(combined_source), members=members)]
+            except re2.error:
+                logger.debug("re2 rejected patterns %s; using re", [p.name for p in patterns])
+        try:
+            combined = re.compile(combined_source)
+        except re.error:
+            # e.g. inline flags or named groups that clash once joined; match one by one.
+            logger.debug("Could not combine patterns %s; matching separately", [p.name for p in patterns])
+            return [
+                _MatchStep(json_pattern=None, regex=p.line_regex, members={0: p})
+                for p in patterns
+            ]
+        return [_MatchStep(json_pattern=None, regex=combined, members=members)]
+
     def _match_line(
         self,
         line: str,
-        patterns: List[_CompiledPattern],
+        plan: List[_MatchStep],
     ) -> Optional[tuple[_CompiledPattern, Dict[str, Any]]]:
-        for pattern in patterns:
-            parsed = self._try_parse(pattern, line)
-            if parsed is not None:
-                return pattern, parsed
+        for step in plan:
+            if step.json_pattern is not None:
+                parsed = self._try_parse_json(line)
+                if parsed is not None:
+                    return step.json_pattern, parsed
+                continue
+
+            match = step.regex.match(line)
+            if not match:
+                continue
+            if len(step.members) == 1 and 0 in step.members:
+                return step.members[0], self._extract_fields(step.members[0], match, 0)
+            # The wrapper group closes last, so lastindex identifies the winning pattern.
+            pattern = step.members[match.lastindex]
+            return pattern, self._extract_fields(pattern, match, match.lastindex)
         return None
 
-    def _try_parse(self, pattern: _CompiledPattern, line: str) -> Optional[Dict[str, Any]]:
-        if pattern.is_json:
-            try:
-                parsed_json = json.loads(line)
-            except json.JSONDecodeError:
-                return None
-            if isinstance(parsed_json, dict):
-                return parsed_json
-            return {"value": parsed_json}
-
-        if not pattern.line_regex:
+    def _try_parse_json(self, line: str) -> Optional[Dict[str, Any]]:
+        # Cheap guard: only lines that look like a JSON object/array reach json.loads.
+        if line.lstrip()[:1] not in ("{", "["):
             return None
-
-        match = pattern.line_regex.match(line)
-        if not match:
+        try:
+            parsed_json = json.loads(line)
+        except json.JSONDecodeError:
             return None
-
+        if isinstance(parsed_json, dict):
+            return parsed_json
+        return {"value": parsed_json}
+
+    def _extract_fields(self, pattern: _CompiledPattern, match: Any, base: int) -> Dict[str, Any]:
+        # Group numbers in group_map are relative to the pattern; base is its wrapper group
+        # in the combined regex (0 when matched on its own).
+        group_count = pattern.line_regex.groups
         fields: Dict[str, Any] = {}
         for key, index in pattern.group_map.items():
-            try:
-                fields[key] = match.group(index)
-            except IndexError:
+            if 0 <= index <= group_count:
+                fields[key] = match.group(base + index)
+            else:
                 logger.debug("Pattern %s missing group %s", pattern.name, index)
 
-        if "message" not in fields and match.group(0):
-            fields["message"] = match.group(0)
+        whole = match.group(base)
+        if "message" not in fields and whole:
+            fields["message"] = whole
 
         return fields
 
     def _consume_continuations(
         self,
-        handle: Any,
+        numbered: Iterator[tuple[int, str]],
         pattern: _CompiledPattern,
         initial_raw: str,
         initial_fields: Dict[str, Any],
-    ) -> tuple[str, Dict[str, Any], int, Optional[str]]:
+    ) -> tuple[str, Dict[str, Any], Optional[tuple[int, str]]]:
         """
         Gather continuation lines that belong to the current log entry.
-        Returns the concatenated raw string, the updated fields, and
-        the count of additional lines consumed along with a buffered
-        non-continuation line (if encountered).
+        Returns the concatenated raw string, the updated fields, and the first
+        non-continuation (line_number, line) pair, if one was read.
         """
 
         extra_lines: List[str] = []
-        consumed = 0
-        buffered: Optional[str] = None
+        pending: Optional[tuple[int, str]] = None
 
-        for next_line in handle:
-            if next_line == "":
-                break
-            candidate = next_line.rstrip("\n")
+        for item in numbered:
+            candidate = item[1]
             if pattern.continue_regex and pattern.continue_regex.match(candidate):
                 extra_lines.append(candidate)
-                consumed += 1
                 continue
 
-            buffered = next_line
+            pending = item
             break
 
         if extra_lines:
@@ -238,7 +344,56 @@ class LogParser:
                 initial_fields["message"] = f"{initial_fields['message']}\n{joined}"
             initial_raw = f"{initial_raw}\n{joined}"
 
-        return initial_raw, initial_fields, consumed, buffered
+        return initial_raw, initial_fields, pending
+
+
+def _iter_lines(handle: Any, stats: Dict[str, Any]) -> Iterator[str]:
+    """
+    Yield the lines of a text handle without their newlines. Reads 1 MiB blocks and
+    splits each with one str.split call instead of a readline + rstrip per line; records
+    stats["line_count"] once the handle is exhausted.
+    """
+
+    count = 0
+    carry = ""
+    while block := handle.read(READ_BLOCK_CHARS):
+        lines = (carry + block).split("\n")
+        carry = lines.pop()
+        count += len(lines)
+        yield from lines
+    if carry:
+        count += 1
+        yield carry
+    stats["line_count"] = count
+
+
+def _maybe_compile(pattern: Optional[str]) -> Optional[Pattern[str]]:
+    return re.compile(pattern) if pattern else None
+
+
+@lru_cache(maxsize=4)
+def _compile_patterns(patterns_path: Path, mtime: float) -> tuple[_CompiledPattern, ...]:
+    """
+    Load and compile a patterns file once per (path, mtime); every LogParser built on
+    the same file, e.g. one per worker, shares the result.
+    """
+
+    pattern_data = orjson.loads(patterns_path.read_bytes())
+
+    compiled: List[_CompiledPattern] = []
+    for name, config in pattern_data.items():
+        compiled.append(
+            _CompiledPattern(
+                name=name,
+                description=config.get("description", ""),
+                is_json=bool(config.get("json", False)),
+                line_regex=_maybe_compile(config.get("line_pattern")),
+                group_map={k: int(v) for k, v in (config.get("groups") or {}).items()},
+                start_regex=_maybe_compile((config.get("multiline") or {}).get("start_pattern")),
+                continue_regex=_maybe_compile((config.get("multiline") or {}).get("continue_pattern")),
+            )
+        )
+    return tuple(compiled)
 
 
 __all__ = ["LogParser", "ParsedLogEntry", "main"]
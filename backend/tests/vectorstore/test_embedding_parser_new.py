@@ -0,0 +1,43 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+np = pytest.importorskip("numpy")
+psycopg = pytest.importorskip("psycopg")
+pytest.importorskip("torch")
+pytest.importorskip("langchain")
+
+from psycopg.adapt import AdaptersMap  # noqa: E402
+
+from src.vectorstore.parser.embedding_parser_new import insert_log_events  # noqa: E402
+
+
+def _connection(*, halfvec: bool) -> tuple[MagicMock, MagicMock]:
+    conn = MagicMock()
+    conn.adapters.types.get.return_value = object() if halfvec else None
+    cur = conn.cursor.return_value.__enter__.return_value
+    # Real adapters, so set_json_dumps can register its passthrough dumper on the cursor.
+    cur.adapters = AdaptersMap(psycopg.adapters)
+    copy = cur.copy.return_value.__enter__.return_value
+    return conn, copy
+
+
+def test_insert_log_events_binary_copy_rows():
+    conn, copy = _connection(halfvec=True)
+    vectors = np.ones((2, 384), dtype=np.float32)
+
+    assert insert_log_events(conn, 7, ["a", "b"], vectors) == 2
+
+    copy.set_types.assert_called_once_with(["int8", "text", "text", "halfvec", "jsonb"])
+    rows = [call.args[0] for call in copy.write_row.call_args_list]
+    assert [row[:3] for row in rows] == [(7, "a", "a"), (7, "b", "b")]
+    assert [row[4] for row in rows] == ['{"chunk_index":0}', '{"chunk_index":1}']
+    conn.commit.assert_called_once()
+
+
+def test_insert_log_events_rejects_mismatched_lengths():
+    conn, copy = _connection(halfvec=True)
+
+    with pytest.raises(ValueError):
+        insert_log_events(conn, 1, ["a", "b"], np.ones((1, 384), dtype=np.float32))
+    copy.write_row.assert_not_called()
@@ -1,4 +1,33 @@
 import os
+from typing import Iterator
+
+
+def _iter_dirs(root: str) -> Iterator[tuple[str, bool]]:
+    """
+    Yield (path, is_empty) for every directory under 'root' (root included), top-down.
+    One os.scandir pass per directory; DirEntry.is_dir() uses the d_type the listing
+    already returned, so no per-entry stat. 'Empty' means no subfolders and no files
+    other than .gitkeep.
+    """
+
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        has_content = False
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        has_content = True
+                        if not entry.is_symlink():  # like os.walk: list, don't follow
+                            subdirs.append(entry.path)
+                    elif entry.name != ".gitkeep":
+                        has_content = True
+        except OSError:
+            continue  # unreadable, as os.walk skips it
+        yield path, not has_content
+        stack.extend(reversed(subdirs))
 
 
 def add_gitkeep_to_empty_dirs(root: str):
@@ -8,23 +37,21 @@ def add_gitkeep_to_empty_dirs(root: str):
     add a .gitkeep file so Git will track it.
     """
 
-    for current_path, dirs, files in os.walk(root):
+    for current_path, is_empty in _iter_dirs(root):
         # Skip the root folder itself if you don't want .gitkeep there
         if current_path == root:
             continue
 
-        # Check if directory contains any non-gitkeep files
-        real_files = [f for f in files if f != ".gitkeep"]
-
         # If no real files AND no subfolders → empty folder
-        if not real_files and not dirs:
+        if is_empty:
             gitkeep_path = os.path.join(current_path, ".gitkeep")
 
-            if not os.path.exists(gitkeep_path):
-                with open(gitkeep_path, "w") as f:
-                    f.write("")  # create empty gitkeep
+            # "x" creates only if missing: one syscall instead of exists() + open().
+            try:
+                with open(gitkeep_path, "x"):
+                    pass  # create empty gitkeep
                 print(f"[added] {gitkeep_path}")
-            else:
+            except FileExistsError:
                 print(f"[exists] {gitkeep_path}")
 
         else:
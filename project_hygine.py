@@ -1,32 +1,66 @@
 import os
 import subprocess
 import sys
+from typing import Iterator
+
+
+def _walk(root) -> Iterator[tuple[str, list, list]]:
+    """
+    os.walk-style (path, dir_names, file_names), top-down, skipping .git, built from one
+    os.scandir pass per directory; DirEntry.is_dir() reads the listing's d_type instead
+    of stat-ing every entry.
+    """
+
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        dirs, files, subdirs = [], [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        if entry.name == ".git":
+                            continue
+                        dirs.append(entry.name)
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    else:
+                        files.append(entry.name)
+        except OSError:
+            continue
+        yield path, dirs, files
+        stack.extend(reversed(subdirs))
+
+
+def _touch(path) -> bool:
+    # "x" creates only if missing: one syscall instead of exists() + open().
+    try:
+        with open(path, "x"):
+            pass
+        return True
+    except FileExistsError:
+        return False
 
 
 def add_gitkeep_to_empty_dirs(root):
-    for current_path, dirs, files in os.walk(root):
-        dirs[:] = [d for d in dirs if d != ".git"]
+    for current_path, dirs, files in _walk(root):
         if current_path == root:
             continue
         real_files = [f for f in files if f != ".gitkeep"]
         if not real_files and not dirs:
             keep_file = os.path.join(current_path, ".gitkeep")
-            if not os.path.exists(keep_file):
-                with open(keep_file, "w") as f:
-                    f.write("")
+            if _touch(keep_file):
                 print(f"[gitkeep] added: {keep_file}")
             else:
                 print(f"[gitkeep] exists: {keep_file}")
 
 
 def ensure_init_files(root):
-    for current_path, dirs, files in os.walk(root):
-        dirs[:] = [d for d in dirs if d != ".git"]
+    for current_path, dirs, files in _walk(root):
         if "__init__.py" not in files and any(d for d in dirs):
             init_file = os.path.join(current_path, "__init__.py")
-            with open(init_file, "w") as f:
-                f.write("")
-            print(f"[init] created: {init_file}")
+            if _touch(init_file):
+                print(f"[init] created: {init_file}")
 
 
 def run_black():
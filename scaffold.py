@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # =========================================================
 # Project Layout:
@@ -10,6 +11,10 @@ import os
 BACKEND_ROOT = "backend"
 FRONTEND_ROOT = "frontend"
 
+# makedirs/open calls are independent; a few threads hide per-call latency on
+# network or bind-mounted filesystems.
+SCAFFOLD_WORKERS = 8
+
 # =========================================================
 # Backend Folder Structure (matches your real project)
 # =========================================================
@@ -85,15 +90,22 @@ FRONTEND_FILES = [
 def create_scaffold(root, structure, files):
     print(f"\n📁 Ensuring structure under: {root}")
 
-    for path in structure:
-        folder = os.path.join(root, path)
-        os.makedirs(folder, exist_ok=True)
+    def make_folder(path):
+        # exist_ok also covers two threads racing on a shared parent.
+        os.makedirs(os.path.join(root, path), exist_ok=True)
+
+    def make_file(file):
+        # "x" creates only if missing: no separate exists() round trip.
+        try:
+            with open(os.path.join(root, file), "x"):
+                pass
+        except FileExistsError:
+            pass
 
-    for file in files:
-        file_path = os.path.join(root, file)
-        if not os.path.exists(file_path):
-            with open(file_path, "w") as f:
-                f.write("")
+    with ThreadPoolExecutor(max_workers=SCAFFOLD_WORKERS) as ex:
+        list(ex.map(make_folder, structure))
+        # Files go in after every folder exists.
+        list(ex.map(make_file, files))
 
     print(f"✅ OK: {root}")
 
@@ -1,8 +1,14 @@
 import os
+import sys
 
 
-def print_tree(start_path, prefix=""):
-    items = sorted(os.listdir(start_path))
+def _sorted_entries(path):
+    # DirEntry.is_dir() reuses the file type from the directory read: no stat per entry.
+    with os.scandir(path) as it:
+        return sorted(it, key=lambda entry: entry.name)
+
+
+def _collect(start_path, prefix, out):
     pointers = {
         "tee": "├── ",
         "last": "└── ",
@@ -10,16 +16,32 @@ def print_tree(start_path, prefix=""):
         "space": "    ",
     }
 
-    for index, item in enumerate(items):
-        path = os.path.join(start_path, item)
-        is_last = index == len(items) - 1
+    # Explicit stack instead of recursion; each level holds its remaining entries
+    # reversed, so pop() yields them in sorted order and an empty list means "last".
+    stack = [(_sorted_entries(start_path)[::-1], prefix)]
+    while stack:
+        remaining, prefix = stack[-1]
+        if not remaining:
+            stack.pop()
+            continue
+
+        entry = remaining.pop()
+        is_last = not remaining
 
         pointer = pointers["last"] if is_last else pointers["tee"]
-        print(prefix + pointer + item)
+        out.append(prefix + pointer + entry.name)
 
-        if os.path.isdir(path):
+        if entry.is_dir(follow_symlinks=False):
             extension = pointers["space"] if is_last else pointers["pipe"]
-            print_tree(path, prefix + extension)
+            stack.append((_sorted_entries(entry.path)[::-1], prefix + extension))
+
+
+def print_tree(start_path, prefix=""):
+    # Build every line first and emit them with one write instead of a print() per entry.
+    out = []
+    _collect(start_path, prefix, out)
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 # Run it